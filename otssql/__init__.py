@@ -7,6 +7,7 @@ from otssql.connection import (
     Connection
 )
 from otssql.constants import FieldType
+from otssql.sdk_api import invalidate_schema_cache
 from otssql.cursor import (
     Cursor,
     DictCursor
@@ -118,5 +119,6 @@ __all__ = [
     "ROWID",
 
     # Other
-    "FieldType"
+    "FieldType",
+    "invalidate_schema_cache"
 ]
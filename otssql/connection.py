@@ -69,6 +69,8 @@ class Connection:
             【Tablestore SDK】单次 DELETE 语句删除的最大记录数
         max_row_total_limit : int, default = 50000
             【Tablestore SDK 常量】limit 与 offset 之和的最大值（固定值 50000，如 tablestore 没有更新不需要修改）
+        where_clause_cache : bool, default = False
+            是否缓存 WHERE 子句转化的查询条件模板（适用于大量执行仅字面值不同的相同 SQL 语句的场景）
         """
         # 存储参数
         self.end_point = end_point
@@ -84,6 +86,7 @@ class Connection:
         self.max_select_row: int = self.kwargs.get("max_select_row", 1000)
         self.max_update_row: int = self.kwargs.get("max_update_row", 1000)
         self.max_delete_row: int = self.kwargs.get("max_delete_row", 1000)
+        self.where_clause_cache: bool = self.kwargs.get("where_clause_cache", False)
 
         # 初始化 OTSClient 客户端
         self.ots_client = tablestore.OTSClient(self.end_point, self.access_key_id, self.access_key_secret,
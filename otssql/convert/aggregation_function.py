@@ -28,7 +28,9 @@ def convert_aggregation_function(ast_node: node.ASTAggregationFunction, alias_na
     alias_name : str
         字段别名
     """
-    if ast_node.name.source().upper() == "COUNT":  # COUNT 函数（允许使用 DISTINCT 和通配符，与其他聚集函数逻辑不一致，单独处理）
+    function_name_upper = ast_node.name.source().upper()
+
+    if function_name_upper == "COUNT":  # COUNT 函数（允许使用 DISTINCT 和通配符，与其他聚集函数逻辑不一致，单独处理）
         if len(ast_node.params) > 1:
             raise NotSupportedError("聚集函数 COUNT 不支持包含超过 1 个参数的语法")
         param = ast_node.params[0]
@@ -44,8 +46,6 @@ def convert_aggregation_function(ast_node: node.ASTAggregationFunction, alias_na
         else:
             return tablestore.Count(param.column_name, name=alias_name)  # COUNT
 
-    function_name_upper = ast_node.name.source().upper()
-
     if len(ast_node.params) > 1:
         raise NotSupportedError(f"聚集函数 {function_name_upper} 不支持包含超过 1 个参数的语法")
 
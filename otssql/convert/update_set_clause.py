@@ -5,6 +5,7 @@ SET 子句转化器
 from typing import Dict
 
 from metasequoia_sql import node
+from otssql.metasequoia_enhance import get_literal_value
 
 __all__ = ["convert_update_set_clause"]
 
@@ -15,5 +16,5 @@ def convert_update_set_clause(update_set_clause: node.ASTUpdateSetClause) -> Dic
     for update_set_column in update_set_clause.columns:
         if not isinstance(update_set_column.column_value, node.ASTLiteralExpression):
             raise KeyError("暂不支持非字面值的 SET 值")
-        put_list.append((update_set_column.column_name, update_set_column.column_value.get_value()))
+        put_list.append((update_set_column.column_name, get_literal_value(update_set_column.column_value)))
     return {"PUT": put_list}
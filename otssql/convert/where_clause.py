@@ -12,23 +12,136 @@ LIKE 表达式 > 通配符查询
 IS NULL 或 IS NOT NULL 表达式 > 列存在性查询
 """
 
-from typing import Any, List, Tuple
+import copy
+import dataclasses
+import functools
+import operator
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import tablestore
 
 from metasequoia_sql import node
-from otssql.exceptions import NotSupportedError, ProgrammingError
+from otssql.exceptions import NotSupportedError
+from otssql.metasequoia_enhance import get_literal_string, get_literal_value, get_node_shape, unquote_source
+from otssql.sdk_api.get_index_field_set import get_primary_key_field_list
 
-__all__ = ["convert_where_clause", "convert_where_clause_to_range"]
+__all__ = ["convert_where_clause", "convert_where_clause_to_range", "convert_where_clause_to_range_fetching",
+           "split_column_and_literal", "primary_key_condition_unsupported", "REVERSED_OPERATOR"]
 
+# 预先绑定热路径中使用的类，减少全局变量和属性的查找次数
+_TermQuery = tablestore.TermQuery
+_RangeQuery = tablestore.RangeQuery
+_BoolQuery = tablestore.BoolQuery
+_ExistsQuery = tablestore.ExistsQuery
+_TermsQuery = tablestore.TermsQuery
+_WildcardQuery = tablestore.WildcardQuery
+_MatchAllQuery = tablestore.MatchAllQuery
+_ColumnNameExpression = node.ASTColumnNameExpression
+_LiteralExpression = node.ASTLiteralExpression
 
-def convert_where_clause(where_clause: node.ASTWhereClause) -> tablestore.Query:
+
+def split_column_and_literal(ast_node: node.ASTOperatorConditionExpression) -> Tuple[str, str, bool]:
+    """拆分比较运算符表达式两侧的字段名和字面值
+
+    Returns
+    -------
+    field_name : str
+        字段名
+    value : str
+        字面值（已去除引号）
+    column_on_left : bool
+        字段名是否在比较运算符左侧
+    """
+    before_value, after_value = ast_node.before_value, ast_node.after_value
+    if isinstance(before_value, _ColumnNameExpression) and isinstance(after_value, _LiteralExpression):
+        return before_value.column_name, get_literal_string(after_value), True  # 字段名 ? 字面值
+    if isinstance(before_value, _LiteralExpression) and isinstance(after_value, _ColumnNameExpression):
+        return after_value.column_name, get_literal_string(before_value), False  # 字面值 ? 字段名
+    raise NotSupportedError("暂不支持的表达式形式（比较运算符前后不是一个字段名、一个字面值）")
+
+
+def _build_equal_query(field_name: str, value: str, column_on_left: bool) -> tablestore.Query:
+    """构造 = 运算符的查询条件"""
+    return _TermQuery(field_name=field_name, column_value=value)
+
+
+def _build_not_equal_query(field_name: str, value: str, column_on_left: bool) -> tablestore.Query:
+    """构造 != 运算符的查询条件"""
+    return _BoolQuery(must_not_queries=[_TermQuery(field_name=field_name, column_value=value)])
+
+
+def _build_less_query(field_name: str, value: str, column_on_left: bool) -> tablestore.Query:
+    """构造 < 运算符的查询条件"""
+    if column_on_left:  # 字段名 < 字面值
+        return _RangeQuery(field_name=field_name, range_to=value, include_upper=False)
+    return _RangeQuery(field_name=field_name, range_from=value, include_lower=False)  # 字面值 < 字段名
+
+
+def _build_less_equal_query(field_name: str, value: str, column_on_left: bool) -> tablestore.Query:
+    """构造 <= 运算符的查询条件"""
+    if column_on_left:  # 字段名 <= 字面值
+        return _RangeQuery(field_name=field_name, range_to=value, include_upper=True)
+    return _RangeQuery(field_name=field_name, range_from=value, include_lower=True)  # 字面值 <= 字段名
+
+
+def _build_greater_query(field_name: str, value: str, column_on_left: bool) -> tablestore.Query:
+    """构造 > 运算符的查询条件"""
+    if column_on_left:  # 字段名 > 字面值
+        return _RangeQuery(field_name=field_name, range_from=value, include_lower=False)
+    return _RangeQuery(field_name=field_name, range_to=value, include_upper=False)  # 字面值 > 字段名
+
+
+def _build_greater_equal_query(field_name: str, value: str, column_on_left: bool) -> tablestore.Query:
+    """构造 >= 运算符的查询条件"""
+    if column_on_left:  # 字段名 >= 字面值
+        return _RangeQuery(field_name=field_name, range_from=value, include_lower=True)
+    return _RangeQuery(field_name=field_name, range_to=value, include_upper=True)  # 字面值 >= 字段名
+
+
+# 比较运算符到多元索引查询条件构造函数的映射
+_OPERATOR_QUERY_BUILDERS = {
+    "=": _build_equal_query,
+    "!=": _build_not_equal_query,
+    "<": _build_less_query,
+    "<=": _build_less_equal_query,
+    ">": _build_greater_query,
+    ">=": _build_greater_equal_query,
+}
+
+# 比较运算符到 Python 比较函数的映射（用于计算两个字面值之间的比较结果）
+_OPERATOR_FUNCTIONS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+# 恒真和恒假的查询条件（用于常量折叠，仅通过 is 判断）
+_TRUE_QUERY = _MatchAllQuery()
+_FALSE_QUERY = _BoolQuery(must_not_queries=[_MatchAllQuery()])
+
+# 字面值在左侧时，交换比较运算符两侧后的等价运算符
+REVERSED_OPERATOR = {"=": "=", "<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+# 主键范围查询中构成下界和上界的比较运算符
+_LOWER_BOUND_OPERATORS = frozenset({"=", ">", ">="})
+_UPPER_BOUND_OPERATORS = frozenset({"=", "<", "<="})
+
+# WHERE 子句编译缓存中字面值占位符的前缀
+_PLACEHOLDER_PREFIX = "\x00otssql:"
+
+
+def convert_where_clause(where_clause: node.ASTWhereClause, use_cache: bool = False) -> tablestore.Query:
     """将 WHERE 语句转化为 TableStore 多元索引查询方式的查询条件
 
     Parameters
     ----------
     where_clause : ASTWhereClause
         WITH 子句的抽象语法树节点
+    use_cache : bool, default = False
+        是否使用 WHERE 子句的编译缓存（将字面值替换为占位符后缓存查询条件模板，命中时仅替换字面值）
 
     Returns
     -------
@@ -36,9 +149,194 @@ def convert_where_clause(where_clause: node.ASTWhereClause) -> tablestore.Query:
         tablestore 的查询对象
     """
     if where_clause is None:
-        return tablestore.MatchAllQuery()
-    res = change_ast_node_to_tablestore_query(where_clause.condition)
-    return res
+        return _MatchAllQuery()
+    if use_cache is True:
+        literals = []
+        template = _parameterize_ast_node(where_clause.condition, literals)
+        return _bind_literals(_compile_where_template(_WhereTemplateKey(template)), literals)
+    res = _simplify_query(change_ast_node_to_tablestore_query(where_clause.condition))
+    return _copy_constant_query(res)
+
+
+class _WhereTemplateKey:
+    """WHERE 子句编译缓存的键：使用模板的结构键计算哈希值和比较是否相等
+
+    冻结的 dataclass 节点在计算哈希值和比较时会逐层递归，很长的逻辑与、逻辑或链会超过递归深度的限制
+    """
+
+    __slots__ = ("template", "shape")
+
+    def __init__(self, template: node.ASTBase):
+        self.template = template
+        self.shape = get_node_shape(template)
+
+    def __hash__(self) -> int:
+        return hash(self.shape)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _WhereTemplateKey) and self.shape == other.shape
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_where_template(template_key: _WhereTemplateKey) -> tablestore.Query:
+    """将字面值已替换为占位符的抽象语法树节点转化为 TableStore 查询条件模板（返回值不可修改）"""
+    return _simplify_query(change_ast_node_to_tablestore_query(template_key.template))
+
+
+def _copy_constant_query(query: tablestore.Query) -> tablestore.Query:
+    """如果 query 是模块级的恒真或恒假查询条件，则返回新的对象，避免调用方修改共享对象"""
+    if query is _TRUE_QUERY:
+        return _MatchAllQuery()
+    if query is _FALSE_QUERY:
+        return _BoolQuery(must_not_queries=[_MatchAllQuery()])
+    return query
+
+
+def _simplify_query(query: tablestore.Query) -> tablestore.Query:
+    """化简查询条件（不修改原查询对象）
+
+    1. 消除双重否定：must_not(must_not(x)) -> x
+    2. 德摩根定律：must_not(should(x, y)) -> must_not(x, y)
+    3. 将逻辑与中的否定条件合并到逻辑与的 must_not_queries 中：must(x, must_not(y)) -> must(x) + must_not(y)
+    """
+    if not isinstance(query, _BoolQuery):
+        return query
+
+    must_queries = [_simplify_query(sub_query) for sub_query in query.must_queries]
+    must_not_queries = [_simplify_query(sub_query) for sub_query in query.must_not_queries]
+    filter_queries = [_simplify_query(sub_query) for sub_query in query.filter_queries]
+    should_queries = [_simplify_query(sub_query) for sub_query in query.should_queries]
+
+    if not must_queries and not filter_queries and not should_queries and len(must_not_queries) == 1:
+        negated_query = must_not_queries[0]
+        if _is_only_clause(negated_query, "must_not_queries"):
+            if len(negated_query.must_not_queries) == 1:
+                return negated_query.must_not_queries[0]  # 消除双重否定
+        elif _is_only_clause(negated_query, "should_queries"):
+            must_not_queries = list(negated_query.should_queries)  # 德摩根定律
+
+    if must_queries and not should_queries:
+        remain_must_queries = []
+        for sub_query in must_queries:
+            if _is_only_clause(sub_query, "must_not_queries"):
+                must_not_queries.extend(sub_query.must_not_queries)
+            else:
+                remain_must_queries.append(sub_query)
+        must_queries = remain_must_queries
+
+    return _BoolQuery(must_queries=must_queries, must_not_queries=must_not_queries,
+                      filter_queries=filter_queries, should_queries=should_queries,
+                      minimum_should_match=query.minimum_should_match)
+
+
+def _is_only_clause(query: tablestore.Query, clause_name: str) -> bool:
+    """判断 query 是否为仅包含 clause_name 子句的 BoolQuery"""
+    if not isinstance(query, _BoolQuery) or query.minimum_should_match is not None:
+        return False
+    for name in ("must_queries", "must_not_queries", "filter_queries", "should_queries"):
+        if (name == clause_name) != bool(getattr(query, name)):
+            return False
+    return True
+
+
+def _parameterize_ast_node(ast_node: node.ASTBase, literals: List[str]) -> node.ASTBase:
+    """将抽象语法树节点中可参数化的字面值替换为占位符，并将去除引号后的字面值依次添加到 literals 中
+
+    IS 和 LIKE 之后的字面值会影响查询条件的构造方式，因此不参数化
+    """
+    # 使用显式的栈代替递归：逻辑运算符节点第一次出栈时将子节点入栈，第二次出栈时使用子节点的结果重新构造节点
+    results: List[node.ASTBase] = []
+    work_stack: List[Tuple[node.ASTBase, bool]] = [(ast_node, False)]
+    while work_stack:
+        current, children_done = work_stack.pop()
+        node_type = type(current)
+        if node_type is node.ASTLogicalAndExpression or node_type is node.ASTLogicalOrExpression:
+            if children_done:
+                after_value = results.pop()
+                before_value = results.pop()
+                results.append(dataclasses.replace(current, before_value=before_value, after_value=after_value))
+            else:
+                work_stack.append((current, True))
+                work_stack.append((current.after_value, False))
+                work_stack.append((current.before_value, False))
+        elif node_type is node.ASTLogicalNotExpression:
+            if children_done:
+                results.append(dataclasses.replace(current, expression=results.pop()))
+            else:
+                work_stack.append((current, True))
+                work_stack.append((current.expression, False))
+        else:
+            results.append(_parameterize_condition(current, literals))
+    return results[0]
+
+
+def _parameterize_condition(ast_node: node.ASTBase, literals: List[str]) -> node.ASTBase:
+    """将逻辑运算符之外的条件表达式中可参数化的字面值替换为占位符"""
+    handler = _PARAMETERIZE_HANDLERS.get(type(ast_node))
+    if handler is None:
+        return ast_node
+    return handler(ast_node, literals)
+
+
+def _parameterize_operator_condition(ast_node: node.ASTOperatorConditionExpression,
+                                     literals: List[str]) -> node.ASTBase:
+    """比较运算符表达式"""
+    if (isinstance(ast_node.before_value, _LiteralExpression)
+            and isinstance(ast_node.after_value, _LiteralExpression)):
+        return ast_node  # 两个字面值之间的比较在编译时直接计算结果，不参数化
+    return dataclasses.replace(ast_node,
+                               before_value=_parameterize_literal(ast_node.before_value, literals),
+                               after_value=_parameterize_literal(ast_node.after_value, literals))
+
+
+def _parameterize_between(ast_node: node.ASTBetweenExpression, literals: List[str]) -> node.ASTBase:
+    """BETWEEN 表达式"""
+    return dataclasses.replace(ast_node,
+                               from_value=_parameterize_literal(ast_node.from_value, literals),
+                               to_value=_parameterize_literal(ast_node.to_value, literals))
+
+
+def _parameterize_in(ast_node: node.ASTInExpression, literals: List[str]) -> node.ASTBase:
+    """IN 表达式"""
+    if not isinstance(ast_node.after_value, node.ASTSubValueExpression):
+        return ast_node
+    values = tuple(_parameterize_literal(value, literals) for value in ast_node.after_value.values)
+    return dataclasses.replace(ast_node, after_value=dataclasses.replace(ast_node.after_value, values=values))
+
+
+# 抽象语法树节点类型到参数化函数的映射（IS 和 LIKE 表达式不参数化）
+_PARAMETERIZE_HANDLERS = {
+    node.ASTOperatorConditionExpression: _parameterize_operator_condition,
+    node.ASTBetweenExpression: _parameterize_between,
+    node.ASTInExpression: _parameterize_in,
+}
+
+
+def _parameterize_literal(ast_node: node.ASTBase, literals: List[str]) -> node.ASTBase:
+    """如果 ast_node 是字面值，则将其替换为占位符"""
+    if not isinstance(ast_node, _LiteralExpression):
+        return ast_node
+    literals.append(get_literal_string(ast_node))
+    return _LiteralExpression(value=f"{_PLACEHOLDER_PREFIX}{len(literals) - 1}")
+
+
+def _bind_literals(query: tablestore.Query, literals: List[str]) -> tablestore.Query:
+    """复制查询条件模板，并将其中的占位符替换为实际的字面值"""
+    result = copy.copy(query)
+    for attr_name, attr_value in vars(query).items():
+        setattr(result, attr_name, _bind_value(attr_value, literals))
+    return result
+
+
+def _bind_value(value: Any, literals: List[str]) -> Any:
+    """将查询条件模板中的属性值的占位符替换为实际的字面值"""
+    if isinstance(value, str) and value.startswith(_PLACEHOLDER_PREFIX):
+        return literals[int(value[len(_PLACEHOLDER_PREFIX):])]
+    if isinstance(value, list):
+        return [_bind_value(item, literals) for item in value]
+    if isinstance(value, tablestore.Query):
+        return _bind_literals(value, literals)
+    return value
 
 
 def change_ast_node_to_tablestore_query(ast_node: node.ASTBase) -> tablestore.Query:
@@ -54,215 +352,330 @@ def change_ast_node_to_tablestore_query(ast_node: node.ASTBase) -> tablestore.Qu
     tablestore.Query
         tablestore 的查询对象
     """
-    if isinstance(ast_node, node.ASTOperatorConditionExpression):  # 比较运算符的表达式
-        if ast_node.operator.source() == "=":
-            if (isinstance(ast_node.before_value, node.ASTColumnNameExpression)
-                    and isinstance(ast_node.after_value, node.ASTLiteralExpression)):
-                # 字段名 = 字面值
-                return tablestore.TermQuery(
-                    field_name=ast_node.before_value.column_name,
-                    column_value=ast_node.after_value.as_string().strip("'")
-                )
-            elif (isinstance(ast_node.before_value, node.ASTLiteralExpression)
-                  and isinstance(ast_node.after_value, node.ASTColumnNameExpression)):
-                # 字面值 = 字段名
-                return tablestore.TermQuery(
-                    field_name=ast_node.after_value.column_name,
-                    column_value=ast_node.before_value.as_string().strip("'")
-                )
-            raise NotSupportedError("暂不支持的表达式形式（比较运算符前后不是一个字段名、一个字面值）")
-        if ast_node.operator.source() == "<":
-            if (isinstance(ast_node.before_value, node.ASTColumnNameExpression)
-                    and isinstance(ast_node.after_value, node.ASTLiteralExpression)):
-                # 字段名 < 字面值
-                return tablestore.RangeQuery(
-                    field_name=ast_node.before_value.column_name,
-                    range_to=ast_node.after_value.as_string().strip("'"),
-                    include_upper=False
-                )
-            elif (isinstance(ast_node.before_value, node.ASTLiteralExpression)
-                  and isinstance(ast_node.after_value, node.ASTColumnNameExpression)):
-                # 字面值 < 字面名
-                return tablestore.RangeQuery(
-                    field_name=ast_node.after_value.column_name,
-                    range_from=ast_node.before_value.as_string().strip("'"),
-                    include_lower=False
-                )
-            raise NotSupportedError("暂不支持的表达式形式（比较运算符前后不是一个字段名、一个字面值）")
-        if ast_node.operator.source() == "<=":
-            if (isinstance(ast_node.before_value, node.ASTColumnNameExpression)
-                    and isinstance(ast_node.after_value, node.ASTLiteralExpression)):
-                # 字段名 <= 字面值
-                return tablestore.RangeQuery(
-                    field_name=ast_node.before_value.column_name,
-                    range_to=ast_node.after_value.as_string().strip("'"),
-                    include_upper=True
-                )
-            elif (isinstance(ast_node.before_value, node.ASTLiteralExpression)
-                  and isinstance(ast_node.after_value, node.ASTColumnNameExpression)):
-                # 字面值 <= 字段名
-                return tablestore.RangeQuery(
-                    field_name=ast_node.after_value.column_name,
-                    range_from=ast_node.before_value.as_string().strip("'"),
-                    include_lower=True
-                )
-            raise NotSupportedError("暂不支持的表达式形式（比较运算符前后不是一个字段名、一个字面值）")
-        if ast_node.operator.source() == ">":
-            if (isinstance(ast_node.before_value, node.ASTColumnNameExpression)
-                    and isinstance(ast_node.after_value, node.ASTLiteralExpression)):
-                # 字段名 > 字面值
-                return tablestore.RangeQuery(
-                    field_name=ast_node.before_value.column_name,
-                    range_from=ast_node.after_value.as_string().strip("'"),
-                    include_lower=False
-                )
-            elif (isinstance(ast_node.before_value, node.ASTLiteralExpression)
-                  and isinstance(ast_node.after_value, node.ASTColumnNameExpression)):
-                # 字面值 > 字段名
-                return tablestore.RangeQuery(
-                    field_name=ast_node.after_value.column_name,
-                    range_to=ast_node.before_value.as_string().strip("'"),
-                    include_upper=False
-                )
-            raise NotSupportedError("暂不支持的表达式形式（比较运算符前后不是一个字段名、一个字面值）")
-        if ast_node.operator.source() == ">=":
-            if (isinstance(ast_node.before_value, node.ASTColumnNameExpression)
-                    and isinstance(ast_node.after_value, node.ASTLiteralExpression)):
-                # 字段名 >= 字面值
-                return tablestore.RangeQuery(
-                    field_name=ast_node.before_value.column_name,
-                    range_from=ast_node.after_value.as_string().strip("'"),
-                    include_lower=True
-                )
-            elif (isinstance(ast_node.before_value, node.ASTLiteralExpression)
-                  and isinstance(ast_node.after_value, node.ASTColumnNameExpression)):
-                # 字面值 >= 字段名
-                return tablestore.RangeQuery(
-                    field_name=ast_node.after_value.column_name,
-                    range_to=ast_node.before_value.as_string().strip("'"),
-                    include_upper=True
-                )
-            raise NotSupportedError("暂不支持的表达式形式（比较运算符前后不是一个字段名、一个字面值）")
-        if ast_node.operator.source() == "!=":
-            if (isinstance(ast_node.before_value, node.ASTColumnNameExpression)
-                    and isinstance(ast_node.after_value, node.ASTLiteralExpression)):
-                # 字段名 != 字面值
-                return tablestore.BoolQuery(must_not_queries=[tablestore.TermQuery(
-                    field_name=ast_node.before_value.column_name,
-                    column_value=ast_node.after_value.as_string().strip("'")
-                )])
-            elif (isinstance(ast_node.before_value, node.ASTLiteralExpression)
-                  and isinstance(ast_node.after_value, node.ASTColumnNameExpression)):
-                # 字面值 != 字段名
-                return tablestore.BoolQuery(must_not_queries=[tablestore.TermQuery(
-                    field_name=ast_node.after_value.column_name,
-                    column_value=ast_node.before_value.as_string().strip("'")
-                )])
-            raise NotSupportedError("暂不支持的表达式形式（比较运算符前后不是一个字段名、一个字面值）")
-    if isinstance(ast_node, node.ASTBetweenExpression):  # BETWEEN 表达式
-        if not isinstance(ast_node.before_value, node.ASTColumnNameExpression):
-            raise NotSupportedError("暂不支持的表达式形式（BETWEEN 之前不是字段名）")
-        if (not isinstance(ast_node.from_value, node.ASTLiteralExpression) or
-                not isinstance(ast_node.to_value, node.ASTLiteralExpression)):
-            raise NotSupportedError("暂不支持的表达式形式（BETWEEN ... AND ... 中的两个值不是字面值）")
-        condition = tablestore.RangeQuery(
-            field_name=ast_node.before_value.column_name,
-            range_from=ast_node.from_value.as_string().strip("'"),
-            include_lower=True,
-            range_to=ast_node.to_value.as_string().strip("'"),
-            include_upper=True
-        )
-        if ast_node.is_not:
-            return tablestore.BoolQuery(must_not_queries=[condition])
-        else:
-            return condition
-    if isinstance(ast_node, node.ASTIsExpression):  # IS NULL 或 IS NOT NULL
-        if not isinstance(ast_node.before_value, node.ASTColumnNameExpression):
-            raise NotSupportedError("暂不支持的表达式形式（IS 之前不是字段名）")
-        if not isinstance(ast_node.after_value,
-                          node.ASTLiteralExpression) or ast_node.after_value.value.upper() != "NULL":
-            raise NotSupportedError("暂不支持的表达式形式（IS 或 IS NOT 后不是 NULL）")
-        condition = tablestore.ExistsQuery(ast_node.before_value.column_name)
-        if ast_node.is_not:
-            return condition
-        else:
-            return tablestore.BoolQuery(must_not_queries=[condition])
-    if isinstance(ast_node, node.ASTInExpression):  # IN 语句
-        if not isinstance(ast_node.before_value, node.ASTColumnNameExpression):
-            raise NotSupportedError("暂不支持的表达式形式（IN 之前不是字段名）")
-        if not isinstance(ast_node.after_value, node.ASTSubValueExpression):
-            raise NotSupportedError("暂不支持的表达式形式（IN 之后不是值列表）")
-        condition = tablestore.TermsQuery(ast_node.before_value.column_name,
-                                          [value.source().strip("'") for value in ast_node.after_value.values])
-        if ast_node.is_not:
-            return tablestore.BoolQuery(must_not_queries=[condition])
+    # 使用显式的栈代替递归：逻辑运算符节点第一次出栈时将子节点入栈，第二次出栈时使用子节点的结果构造查询条件
+    results: List[tablestore.Query] = []
+    work_stack: List[Tuple[node.ASTBase, Optional[int]]] = [(ast_node, None)]
+    while work_stack:
+        current, n_children = work_stack.pop()
+        node_type = type(current)
+
+        if n_children is not None:  # 子节点均已转化
+            children_results = results[len(results) - n_children:]
+            del results[len(results) - n_children:]
+            results.append(_LOGICAL_QUERY_COMBINERS[node_type](children_results))
+            continue
+
+        if node_type is node.ASTLogicalNotExpression:
+            children = [current.expression]
+        elif node_type is node.ASTLogicalAndExpression or node_type is node.ASTLogicalOrExpression:
+            children = _flatten_logical_chain(current, node_type)
         else:
-            return condition
-    if isinstance(ast_node, node.ASTLikeExpression):  # LIKE 语句
-        if not isinstance(ast_node.before_value, node.ASTColumnNameExpression):
-            raise NotSupportedError("暂不支持的表达式形式（LIKE 之前不是字段名）")
-        if not isinstance(ast_node.after_value, node.ASTLiteralExpression):
-            raise NotSupportedError("暂不支持的表达式形式（LIKE 之后不是字面值）")
-        condition = tablestore.WildcardQuery(ast_node.before_value.column_name,
-                                             ast_node.after_value.as_string().strip("'").replace("%", "*"))
-        if ast_node.is_not:
-            return tablestore.BoolQuery(must_not_queries=[condition])
+            handler = _QUERY_HANDLERS.get(node_type)
+            if handler is None:
+                raise NotSupportedError(f"暂无法支持的 WHERE 条件（不是比较运算符的形式）: {current}")
+            results.append(handler(current))
+            continue
+
+        work_stack.append((current, len(children)))
+        work_stack.extend((child, None) for child in reversed(children))
+
+    return results[0]
+
+
+def _query_of_operator_condition(ast_node: node.ASTOperatorConditionExpression) -> tablestore.Query:
+    """比较运算符的表达式"""
+    operator_source = ast_node.operator.source()
+    builder = _OPERATOR_QUERY_BUILDERS.get(operator_source)
+    if builder is None:
+        raise NotSupportedError(f"暂无法支持的 WHERE 条件（不支持的比较运算符）: {ast_node}")
+    if (isinstance(ast_node.before_value, _LiteralExpression)
+            and isinstance(ast_node.after_value, _LiteralExpression)):
+        return _fold_literal_comparison(operator_source, ast_node.before_value, ast_node.after_value)  # 字面值 ? 字面值
+    return builder(*split_column_and_literal(ast_node))
+
+
+def _fold_literal_comparison(operator_source: str,
+                             before_value: node.ASTLiteralExpression,
+                             after_value: node.ASTLiteralExpression) -> tablestore.Query:
+    """计算两个字面值之间的比较结果，返回恒真或恒假的查询条件
+
+    仅计算同类型的非 NULL 字面值之间的比较：与 NULL 比较的结果为 NULL（在 NOT 中不能视为恒假），不同类型字面值之间的比较需要
+    按 SQL 的规则转换类型（例如 1 = '1' 成立），均不在此计算
+    """
+    value1, value2 = get_literal_value(before_value), get_literal_value(after_value)
+    if value1 is None or value2 is None or _literal_type(value1) is not _literal_type(value2):
+        raise NotSupportedError(f"暂不支持的表达式形式（无法比较字面值 {before_value.value} 和 {after_value.value}）")
+    return _TRUE_QUERY if _OPERATOR_FUNCTIONS[operator_source](value1, value2) else _FALSE_QUERY
+
+
+def _literal_type(value: Any) -> type:
+    """字面值的比较类型：整数和浮点数均为数值，可以直接比较"""
+    return float if type(value) is int else type(value)
+
+
+def _query_of_between(ast_node: node.ASTBetweenExpression) -> tablestore.Query:
+    """BETWEEN 表达式"""
+    if not isinstance(ast_node.before_value, _ColumnNameExpression):
+        raise NotSupportedError("暂不支持的表达式形式（BETWEEN 之前不是字段名）")
+    if (not isinstance(ast_node.from_value, _LiteralExpression) or
+            not isinstance(ast_node.to_value, _LiteralExpression)):
+        raise NotSupportedError("暂不支持的表达式形式（BETWEEN ... AND ... 中的两个值不是字面值）")
+    condition = _RangeQuery(
+        field_name=ast_node.before_value.column_name,
+        range_from=get_literal_string(ast_node.from_value),
+        include_lower=True,
+        range_to=get_literal_string(ast_node.to_value),
+        include_upper=True
+    )
+    if ast_node.is_not:
+        return _BoolQuery(must_not_queries=[condition])
+    else:
+        return condition
+
+
+def _query_of_is(ast_node: node.ASTIsExpression) -> tablestore.Query:
+    """IS NULL 或 IS NOT NULL"""
+    if not isinstance(ast_node.before_value, _ColumnNameExpression):
+        raise NotSupportedError("暂不支持的表达式形式（IS 之前不是字段名）")
+    if not isinstance(ast_node.after_value,
+                      _LiteralExpression) or ast_node.after_value.value.upper() != "NULL":
+        raise NotSupportedError("暂不支持的表达式形式（IS 或 IS NOT 后不是 NULL）")
+    condition = _ExistsQuery(ast_node.before_value.column_name)
+    if ast_node.is_not:
+        return condition
+    else:
+        return _BoolQuery(must_not_queries=[condition])
+
+
+def _query_of_in(ast_node: node.ASTInExpression) -> tablestore.Query:
+    """IN 语句"""
+    if not isinstance(ast_node.before_value, _ColumnNameExpression):
+        raise NotSupportedError("暂不支持的表达式形式（IN 之前不是字段名）")
+    if not isinstance(ast_node.after_value, node.ASTSubValueExpression):
+        raise NotSupportedError("暂不支持的表达式形式（IN 之后不是值列表）")
+    condition = _TermsQuery(ast_node.before_value.column_name,
+                            list(map(unquote_source, ast_node.after_value.values)))
+    if ast_node.is_not:
+        return _BoolQuery(must_not_queries=[condition])
+    else:
+        return condition
+
+
+def _query_of_like(ast_node: node.ASTLikeExpression) -> tablestore.Query:
+    """LIKE 语句"""
+    if not isinstance(ast_node.before_value, _ColumnNameExpression):
+        raise NotSupportedError("暂不支持的表达式形式（LIKE 之前不是字段名）")
+    if not isinstance(ast_node.after_value, _LiteralExpression):
+        raise NotSupportedError("暂不支持的表达式形式（LIKE 之后不是字面值）")
+    condition = _WildcardQuery(ast_node.before_value.column_name,
+                               get_literal_string(ast_node.after_value).replace("%", "*"))
+    if ast_node.is_not:
+        return _BoolQuery(must_not_queries=[condition])
+    else:
+        return condition
+
+
+def _combine_logical_and(conditions: List[tablestore.Query]) -> tablestore.Query:
+    """逻辑与表达式（将连续的逻辑与展开为一个 BoolQuery）
+
+    恒真的子条件直接忽略；如果存在恒假的子条件，则整个表达式恒假
+    """
+    must_queries = []
+    for condition in conditions:
+        if condition is _FALSE_QUERY:
+            return _FALSE_QUERY
+        if condition is not _TRUE_QUERY:
+            must_queries.append(condition)
+    if not must_queries:
+        return _TRUE_QUERY
+    if len(must_queries) == 1:
+        return must_queries[0]
+    return _BoolQuery(must_queries=must_queries)
+
+
+def _combine_logical_or(conditions: List[tablestore.Query]) -> tablestore.Query:
+    """逻辑或表达式（将连续的逻辑或展开为一个 BoolQuery）
+
+    恒假的子条件直接忽略；如果存在恒真的子条件，则整个表达式恒真
+    """
+    should_queries = []
+    for condition in conditions:
+        if condition is _TRUE_QUERY:
+            return _TRUE_QUERY
+        if condition is not _FALSE_QUERY:
+            should_queries.append(condition)
+    if not should_queries:
+        return _FALSE_QUERY
+    if len(should_queries) == 1:
+        return should_queries[0]
+    return _BoolQuery(should_queries=should_queries)
+
+
+def _combine_logical_not(conditions: List[tablestore.Query]) -> tablestore.Query:
+    """逻辑否表达式"""
+    condition1 = conditions[0]
+    if condition1 is _TRUE_QUERY:
+        return _FALSE_QUERY
+    if condition1 is _FALSE_QUERY:
+        return _TRUE_QUERY
+    return _BoolQuery(must_not_queries=[condition1])
+
+
+def _flatten_logical_chain(ast_node: node.ASTBase, chain_type: type) -> List[node.ASTBase]:
+    """将连续的同类逻辑运算符表达式展开，按从左到右的顺序返回各个子表达式"""
+    operands = []
+    stack = [ast_node]
+    while stack:
+        current = stack.pop()
+        if type(current) is chain_type:
+            stack.append(current.after_value)
+            stack.append(current.before_value)
         else:
-            return condition
-    if isinstance(ast_node, node.ASTLogicalAndExpression):  # 逻辑与表达式
-        condition1 = change_ast_node_to_tablestore_query(ast_node.before_value)
-        condition2 = change_ast_node_to_tablestore_query(ast_node.after_value)
-        return tablestore.BoolQuery(must_queries=[condition1, condition2])
-    if isinstance(ast_node, node.ASTLogicalOrExpression):  # 逻辑或表达式
-        condition1 = change_ast_node_to_tablestore_query(ast_node.before_value)
-        condition2 = change_ast_node_to_tablestore_query(ast_node.after_value)
-        return tablestore.BoolQuery(should_queries=[condition1, condition2])
-    if isinstance(ast_node, node.ASTLogicalNotExpression):  # 逻辑否表达式
-        condition1 = change_ast_node_to_tablestore_query(ast_node.expression)
-        return tablestore.BoolQuery(must_not_queries=[condition1])
-    if isinstance(ast_node, node.ASTLogicalXorExpression):  # 逻辑异或表达式
-        raise NotSupportedError("无法使用多元索引（不支持逻辑异或的查询方法）")
-    raise KeyError(f"暂无法支持的 WHERE 条件（不是比较运算符的形式）: {ast_node}")
-
-
-def convert_where_clause_to_range(ots_client: tablestore.OTSClient,
-                                  table_name: str,
+            operands.append(current)
+    return operands
+
+
+def _query_of_logical_xor(ast_node: node.ASTLogicalXorExpression) -> tablestore.Query:
+    """逻辑异或表达式"""
+    raise NotSupportedError("无法使用多元索引（不支持逻辑异或的查询方法）")
+
+
+# 抽象语法树节点类型到多元索引查询条件转化函数的映射
+_QUERY_HANDLERS = {
+    node.ASTOperatorConditionExpression: _query_of_operator_condition,
+    node.ASTBetweenExpression: _query_of_between,
+    node.ASTIsExpression: _query_of_is,
+    node.ASTInExpression: _query_of_in,
+    node.ASTLikeExpression: _query_of_like,
+    node.ASTLogicalXorExpression: _query_of_logical_xor,
+}
+
+# 逻辑运算符节点类型到组合子节点查询条件的函数的映射
+_LOGICAL_QUERY_COMBINERS = {
+    node.ASTLogicalAndExpression: _combine_logical_and,
+    node.ASTLogicalOrExpression: _combine_logical_or,
+    node.ASTLogicalNotExpression: _combine_logical_not,
+}
+
+
+def convert_where_clause_to_range(schema_primary_key: List[str],
                                   where_clause: node.ASTWhereClause) -> Tuple[List[tuple], List[tuple]]:
     """将 WHERE 语句转化为 Tablestore 范围查询的最小和最大主键
 
     Parameters
     ----------
-    ots_client : tablestore.OTSClient
-        OTS 客户端
-    table_name : str
-        表名
+    schema_primary_key : List[str]
+        表的主键字段列表（有序）
     where_clause : ASTWhereClause
         WITH 子句的抽象语法树节点
 
     Returns
     -------
     start_primary_key : List[tuple]
-        最小主键
+        最小主键（包含）
     end_primary_key : List[tuple]
-        最大主键
-    """
-    # 获取主键索引
-    try:
-        describe_response = ots_client.describe_table(table_name)
-        schema_primary_key = [primary_key for primary_key, _ in describe_response.table_meta.schema_of_primary_key]
-    except Exception:
-        raise ProgrammingError("获取表描述信息失败")
+        最大主键（不包含）
 
+    Raises
+    ------
+    NotSupportedError
+        WHERE 子句中包含无法转化为主键范围查询的条件
+    """
     if where_clause is None:
         start_primary_key = []
         end_primary_key = []
-        for field_name, field_type in schema_primary_key:
+        for field_name in schema_primary_key:
             start_primary_key.append((field_name, tablestore.INF_MIN))
             end_primary_key.append((field_name, tablestore.INF_MAX))
         return start_primary_key, end_primary_key
 
-    conditions = change_ast_node_to_primary_key_condition(where_clause)
-    print(conditions)
+    # 将各字段的条件整理为下界和上界：(值, 是否包含边界值)
+    primary_key_set = set(schema_primary_key)
+    lower_bounds: Dict[str, Tuple[Any, bool]] = {}
+    upper_bounds: Dict[str, Tuple[Any, bool]] = {}
+    for field_name, operator_source, value in change_ast_node_to_primary_key_condition(where_clause.condition):
+        if field_name not in primary_key_set:
+            raise NotSupportedError(f"主键索引不支持非主键字段的查询条件: {field_name}")
+        if operator_source in _LOWER_BOUND_OPERATORS:
+            if field_name in lower_bounds:
+                raise NotSupportedError(f"主键索引不支持在同一个字段上包含多个下界条件: {field_name}")
+            lower_bounds[field_name] = (value, operator_source != ">")
+        if operator_source in _UPPER_BOUND_OPERATORS:
+            if field_name in upper_bounds:
+                raise NotSupportedError(f"主键索引不支持在同一个字段上包含多个上界条件: {field_name}")
+            upper_bounds[field_name] = (value, operator_source != "<")
+
+    # 前缀字段为等值条件时，直接作为起止主键的相同部分
+    start_primary_key = []
+    end_primary_key = []
+    idx = 0
+    while idx < len(schema_primary_key) - 1:
+        field_name = schema_primary_key[idx]
+        lower, upper = lower_bounds.get(field_name), upper_bounds.get(field_name)
+        if lower is None or upper is None or lower[0] != upper[0] or not lower[1] or not upper[1]:
+            break
+        start_primary_key.append((field_name, lower[0]))
+        end_primary_key.append((field_name, upper[0]))
+        idx += 1
+
+    # 第一个非等值字段使用范围条件，其后的字段不能再包含条件，用 INF_MIN / INF_MAX 补齐
+    field_name = schema_primary_key[idx]
+    remain_fields = schema_primary_key[idx + 1:]
+    for remain_field in remain_fields:
+        if remain_field in lower_bounds or remain_field in upper_bounds:
+            raise NotSupportedError(f"主键索引不支持在范围条件之后的主键字段上包含条件: {remain_field}")
+
+    # 起始主键包含边界值：剩余字段补 INF_MIN；不包含边界值：剩余字段补 INF_MAX
+    lower = lower_bounds.get(field_name)
+    if lower is None:
+        start_primary_key.append((field_name, tablestore.INF_MIN))
+        start_fill = tablestore.INF_MIN
+    else:
+        if not lower[1] and not remain_fields:
+            raise NotSupportedError(f"主键索引不支持在最后一个主键字段上使用 > 条件: {field_name}")
+        start_primary_key.append((field_name, lower[0]))
+        start_fill = tablestore.INF_MIN if lower[1] else tablestore.INF_MAX
+
+    # 结束主键不包含边界值：剩余字段补 INF_MIN；包含边界值：剩余字段补 INF_MAX
+    upper = upper_bounds.get(field_name)
+    if upper is None:
+        end_primary_key.append((field_name, tablestore.INF_MAX))
+        end_fill = tablestore.INF_MAX
+    else:
+        if upper[1] and not remain_fields:
+            raise NotSupportedError(f"主键索引不支持在最后一个主键字段上使用 <= 或 = 条件: {field_name}")
+        end_primary_key.append((field_name, upper[0]))
+        end_fill = tablestore.INF_MAX if upper[1] else tablestore.INF_MIN
+
+    for remain_field in remain_fields:
+        start_primary_key.append((remain_field, start_fill))
+        end_primary_key.append((remain_field, end_fill))
+    return start_primary_key, end_primary_key
+
+
+def convert_where_clause_to_range_fetching(ots_client: tablestore.OTSClient,
+                                           table_name: str,
+                                           where_clause: node.ASTWhereClause) -> Tuple[List[tuple], List[tuple]]:
+    """获取表的主键字段列表（优先使用缓存），并将 WHERE 语句转化为 Tablestore 范围查询的最小和最大主键
+
+    Parameters
+    ----------
+    ots_client : tablestore.OTSClient
+        OTS 客户端
+    table_name : str
+        表名
+    where_clause : ASTWhereClause
+        WITH 子句的抽象语法树节点
+
+    Returns
+    -------
+    start_primary_key : List[tuple]
+        最小主键
+    end_primary_key : List[tuple]
+        最大主键
+    """
+    schema_primary_key = get_primary_key_field_list(ots_client, table_name)
+    return convert_where_clause_to_range(schema_primary_key, where_clause)
 
 
 def change_ast_node_to_primary_key_condition(ast_node: node.ASTBase) -> List[Tuple[str, str, Any]]:
@@ -273,103 +686,64 @@ def change_ast_node_to_primary_key_condition(ast_node: node.ASTBase) -> List[Tup
     ast_node : ASTBase
         抽象语法树节点
     """
-    if isinstance(ast_node, node.ASTOperatorConditionExpression):  # 比较运算符的表达式
-        if ast_node.operator.source() == "=":
-            if (isinstance(ast_node.before_value, node.ASTColumnNameExpression)
-                    and isinstance(ast_node.after_value, node.ASTLiteralExpression)):
-                # 字段名 = 字面值
-                return [
-                    (ast_node.before_value.column_name, "=", ast_node.after_value.as_string().strip("'")),
-                ]
-            elif (isinstance(ast_node.before_value, node.ASTLiteralExpression)
-                  and isinstance(ast_node.after_value, node.ASTColumnNameExpression)):
-                # 字面值 = 字段名
-                return [
-                    (ast_node.after_value.column_name, "=", ast_node.before_value.as_string().strip("'")),
-                ]
-            raise NotSupportedError("暂不支持的表达式形式（比较运算符前后不是一个字段名、一个字面值）")
-        if ast_node.operator.source() == "<":
-            if (isinstance(ast_node.before_value, node.ASTColumnNameExpression)
-                    and isinstance(ast_node.after_value, node.ASTLiteralExpression)):
-                # 字段名 < 字面值
-                return [
-                    (ast_node.before_value.column_name, "<", ast_node.after_value.as_string().strip("'")),
-                ]
-            elif (isinstance(ast_node.before_value, node.ASTLiteralExpression)
-                  and isinstance(ast_node.after_value, node.ASTColumnNameExpression)):
-                # 字面值 < 字面名
-                return [
-                    (ast_node.after_value.column_name, "<", ast_node.before_value.as_string().strip("'")),
-                ]
-            raise NotSupportedError("暂不支持的表达式形式（比较运算符前后不是一个字段名、一个字面值）")
-        if ast_node.operator.source() == "<=":
-            if (isinstance(ast_node.before_value, node.ASTColumnNameExpression)
-                    and isinstance(ast_node.after_value, node.ASTLiteralExpression)):
-                # 字段名 <= 字面值
-                return [
-                    (ast_node.before_value.column_name, "<=", ast_node.after_value.as_string().strip("'")),
-                ]
-            elif (isinstance(ast_node.before_value, node.ASTLiteralExpression)
-                  and isinstance(ast_node.after_value, node.ASTColumnNameExpression)):
-                # 字面值 <= 字段名
-                return [
-                    (ast_node.after_value.column_name, "<=", ast_node.before_value.as_string().strip("'")),
-                ]
-            raise NotSupportedError("暂不支持的表达式形式（比较运算符前后不是一个字段名、一个字面值）")
-        if ast_node.operator.source() == ">":
-            if (isinstance(ast_node.before_value, node.ASTColumnNameExpression)
-                    and isinstance(ast_node.after_value, node.ASTLiteralExpression)):
-                # 字段名 > 字面值
-                return [
-                    (ast_node.before_value.column_name, ">", ast_node.after_value.as_string().strip("'")),
-                ]
-            elif (isinstance(ast_node.before_value, node.ASTLiteralExpression)
-                  and isinstance(ast_node.after_value, node.ASTColumnNameExpression)):
-                # 字面值 > 字段名
-                return [
-                    (ast_node.after_value.column_name, ">", ast_node.before_value.as_string().strip("'")),
-                ]
-            raise NotSupportedError("暂不支持的表达式形式（比较运算符前后不是一个字段名、一个字面值）")
-        if ast_node.operator.source() == ">=":
-            if (isinstance(ast_node.before_value, node.ASTColumnNameExpression)
-                    and isinstance(ast_node.after_value, node.ASTLiteralExpression)):
-                # 字段名 >= 字面值
-                return [
-                    (ast_node.before_value.column_name, ">=", ast_node.after_value.as_string().strip("'")),
-                ]
-            elif (isinstance(ast_node.before_value, node.ASTLiteralExpression)
-                  and isinstance(ast_node.after_value, node.ASTColumnNameExpression)):
-                # 字面值 >= 字段名
-                return [
-                    (ast_node.after_value.column_name, ">=", ast_node.before_value.as_string().strip("'")),
-                ]
-            raise NotSupportedError("暂不支持的表达式形式（比较运算符前后不是一个字段名、一个字面值）")
-        if ast_node.operator.source() == "!=":
-            raise NotSupportedError("主键索引不支持 != 运算符")
-    if isinstance(ast_node, node.ASTBetweenExpression):  # BETWEEN 表达式
-        if not isinstance(ast_node.before_value, node.ASTColumnNameExpression):
-            raise NotSupportedError("暂不支持的表达式形式（BETWEEN 之前不是字段名）")
-        if (not isinstance(ast_node.from_value, node.ASTLiteralExpression) or
-                not isinstance(ast_node.to_value, node.ASTLiteralExpression)):
-            raise NotSupportedError("暂不支持的表达式形式（BETWEEN ... AND ... 中的两个值不是字面值）")
-        return [
-            (ast_node.before_value.column_name, ">=", ast_node.from_value.as_string().strip("'")),
-            (ast_node.before_value.column_name, "<=", ast_node.to_value.as_string().strip("'")),
-        ]
-    if isinstance(ast_node, node.ASTIsExpression):  # IS NULL 或 IS NOT NULL
-        raise NotSupportedError("主键索引不支持 IS 运算符")
-    if isinstance(ast_node, node.ASTInExpression):  # IN 语句
-        raise NotSupportedError("主键索引不支持 IN 运算符")  # TODO 待修改
-    if isinstance(ast_node, node.ASTLikeExpression):  # LIKE 语句
-        raise NotSupportedError("主键索引不支持 LIKE 运算符")
-    if isinstance(ast_node, node.ASTLogicalAndExpression):  # 逻辑与表达式
-        condition1: List[tuple] = change_ast_node_to_primary_key_condition(ast_node.before_value)
-        condition2: List[tuple] = change_ast_node_to_primary_key_condition(ast_node.after_value)
-        return condition1 + condition2
-    if isinstance(ast_node, node.ASTLogicalOrExpression):  # 逻辑或表达式
-        raise NotSupportedError("主键索引不支持 OR 运算符")
-    if isinstance(ast_node, node.ASTLogicalNotExpression):  # 逻辑否表达式
-        raise NotSupportedError("主键索引不支持 NOT 运算符")
-    if isinstance(ast_node, node.ASTLogicalXorExpression):  # 逻辑异或表达式
-        raise NotSupportedError("主键索引不支持 XOR 运算符")
-    raise KeyError(f"暂无法支持的 WHERE 条件（不是比较运算符的形式）: {ast_node}")
+    # 使用显式的栈代替递归：逻辑与的两侧按从左到右的顺序依次处理
+    conditions = []
+    stack = [ast_node]
+    while stack:
+        current = stack.pop()
+        if type(current) is node.ASTLogicalAndExpression:
+            stack.append(current.after_value)
+            stack.append(current.before_value)
+            continue
+        handler = _PRIMARY_KEY_CONDITION_HANDLERS.get(type(current))
+        if handler is None:
+            raise NotSupportedError(f"暂无法支持的 WHERE 条件（不是比较运算符的形式）: {current}")
+        conditions.extend(handler(current))
+    return conditions
+
+
+def _primary_key_condition_of_operator_condition(ast_node: node.ASTOperatorConditionExpression
+                                                 ) -> List[Tuple[str, str, Any]]:
+    """比较运算符的表达式"""
+    operator_source = ast_node.operator.source()
+    if operator_source == "!=":
+        raise NotSupportedError("主键索引不支持 != 运算符")
+    if operator_source not in REVERSED_OPERATOR:
+        raise NotSupportedError(f"暂无法支持的 WHERE 条件（不支持的比较运算符）: {ast_node}")
+    field_name, value, column_on_left = split_column_and_literal(ast_node)
+    return [(field_name, operator_source if column_on_left else REVERSED_OPERATOR[operator_source], value)]
+
+
+def _primary_key_condition_of_between(ast_node: node.ASTBetweenExpression) -> List[Tuple[str, str, Any]]:
+    """BETWEEN 表达式"""
+    if not isinstance(ast_node.before_value, _ColumnNameExpression):
+        raise NotSupportedError("暂不支持的表达式形式（BETWEEN 之前不是字段名）")
+    if (not isinstance(ast_node.from_value, _LiteralExpression) or
+            not isinstance(ast_node.to_value, _LiteralExpression)):
+        raise NotSupportedError("暂不支持的表达式形式（BETWEEN ... AND ... 中的两个值不是字面值）")
+    return [
+        (ast_node.before_value.column_name, ">=", get_literal_string(ast_node.from_value)),
+        (ast_node.before_value.column_name, "<=", get_literal_string(ast_node.to_value)),
+    ]
+
+
+def primary_key_condition_unsupported(message: str) -> Callable[[node.ASTBase], List[Tuple[str, str, Any]]]:
+    """构造主键索引不支持的表达式的处理函数"""
+
+    def handler(ast_node: node.ASTBase) -> List[Tuple[str, str, Any]]:
+        raise NotSupportedError(message)
+
+    return handler
+
+
+# 抽象语法树节点类型到主键条件转化函数的映射
+_PRIMARY_KEY_CONDITION_HANDLERS = {
+    node.ASTOperatorConditionExpression: _primary_key_condition_of_operator_condition,
+    node.ASTBetweenExpression: _primary_key_condition_of_between,
+    node.ASTIsExpression: primary_key_condition_unsupported("主键索引不支持 IS 运算符"),
+    node.ASTInExpression: primary_key_condition_unsupported("主键索引不支持 IN 运算符"),  # TODO 待修改
+    node.ASTLikeExpression: primary_key_condition_unsupported("主键索引不支持 LIKE 运算符"),
+    node.ASTLogicalOrExpression: primary_key_condition_unsupported("主键索引不支持 OR 运算符"),
+    node.ASTLogicalNotExpression: primary_key_condition_unsupported("主键索引不支持 NOT 运算符"),
+    node.ASTLogicalXorExpression: primary_key_condition_unsupported("主键索引不支持 XOR 运算符"),
+}
@@ -6,14 +6,21 @@
 
 from typing import Optional
 
+import tablestore
+
 from metasequoia_sql import SQLParser, node
 from otssql import convert, strategy
-from otssql.exceptions import NotSupportedError, ProgrammingError
-from otssql.metasequoia_enhance import is_aggregation_query
+from otssql.exceptions import DatabaseError, NotSupportedError, ProgrammingError
+from otssql.metasequoia_enhance import get_select_column_set, is_aggregation_query
 from otssql.objects import IndexType, UseIndex
+from otssql.sdk_api import invalidate_schema_cache
 
 __all__ = ["Cursor", "DictCursor"]
 
+# 表示表结构或多元索引已变化的 Tablestore 错误码（表或多元索引不存在、主键结构不一致）
+_SCHEMA_MISMATCH_ERROR_CODES = frozenset({"OTSObjectNotExist", "OTSMetaNotMatch"})
+_SEARCH_INDEX = IndexType.SEARCH_INDEX  # 预先绑定热路径中比较的索引类型，避免每次比较时在 IndexType 上查找枚举成员
+
 
 class Cursor:
     """
@@ -311,40 +318,56 @@ class Cursor:
             table_name=table_name,
             statement=statement)
 
-        print(use_index)
-
+        try:
+            return self._execute_statement(statement, table_name, use_index)
+        except (tablestore.OTSServiceError, DatabaseError) as e:
+            # 表结构或多元索引已变化时，清除该表缓存的表结构和多元索引结构，下次执行时重新选择索引（写入请求的服务端异常被包装为
+            # DatabaseError，需要检查其原因）
+            service_error = e if isinstance(e, tablestore.OTSServiceError) else e.__cause__
+            if (isinstance(service_error, tablestore.OTSServiceError)
+                    and service_error.get_error_code() in _SCHEMA_MISMATCH_ERROR_CODES):
+                invalidate_schema_cache(table_name)
+            raise
+
+    def _execute_statement(self, statement: node.ASTBase, table_name: str, use_index: UseIndex) -> int:
+        """使用已选择的索引执行 SQL 语句"""
         if isinstance(statement, node.ASTSingleSelectStatement):
             if statement.group_by_clause is not None:
                 # 执行包含 GROUP BY 的 SELECT 语句
-                if use_index.index_type != IndexType.SEARCH_INDEX:
+                if use_index.index_type != _SEARCH_INDEX:
                     raise NotSupportedError("无法在包含 GROUP BY 子句的情况下使用主键索引")
 
                 # TODO 增加 GROUP BY 语句包含通配符的异常
                 self.current_result, self.description = strategy.execute_select_group_by(
                     self.connection.ots_client, table_name, use_index.index_name, statement,
-                    max_group_size=self.connection.max_group_size)
+                    max_group_size=self.connection.max_group_size,
+                    where_clause_cache=self.connection.where_clause_cache)
                 self.current_idx = 0
                 self.rowcount = len(self.current_result)
                 return self.rowcount
 
-            if not is_aggregation_query(statement):
+            # 判断是否为聚合查询和执行普通 SELECT 语句共用同一个 SELECT 子句的字段清单，只遍历一次 SELECT 子句
+            select_column_set = get_select_column_set(statement.select_clause)
+            if not is_aggregation_query(statement, select_column_set):
                 # 执行非聚合、非 GROUP BY 的普通 SELECT 语句
                 self.current_result, self.description = strategy.execute_select_normal(
                     self.connection.ots_client, table_name, use_index, statement,
                     max_row_per_request=self.connection.max_row_per_request,
                     max_select_row=self.connection.max_select_row,
-                    max_row_total_limit=self.connection.max_row_total_limit)
+                    max_row_total_limit=self.connection.max_row_total_limit,
+                    where_clause_cache=self.connection.where_clause_cache,
+                    select_column_set=select_column_set)
                 self.current_idx = 0
                 self.rowcount = len(self.current_result)
                 return self.rowcount
 
-            if use_index.index_type != IndexType.SEARCH_INDEX:
+            if use_index.index_type != _SEARCH_INDEX:
                 raise NotSupportedError("无法在包含聚合函数的情况下使用主键索引")
 
             # 执行包含聚合的 SELECT 语句
-            self.current_result, self.description = strategy.execute_select_aggregation(self.connection.ots_client,
-                                                                                        table_name,
-                                                                                        use_index.index_name, statement)
+            self.current_result, self.description = strategy.execute_select_aggregation(
+                self.connection.ots_client, table_name, use_index.index_name, statement,
+                where_clause_cache=self.connection.where_clause_cache)
             self.current_idx = 0
             self.rowcount = len(self.current_result)
             return self.rowcount
@@ -355,7 +378,8 @@ class Cursor:
                                                     statement,
                                                     max_row_per_request=self.connection.max_row_per_request,
                                                     max_update_row=self.connection.max_update_row,
-                                                    max_row_total_limit=self.connection.max_row_total_limit)
+                                                    max_row_total_limit=self.connection.max_row_total_limit,
+                                                    where_clause_cache=self.connection.where_clause_cache)
             return self.rowcount
 
         if isinstance(statement, node.ASTDeleteStatement):
@@ -364,7 +388,8 @@ class Cursor:
                                                     statement,
                                                     max_row_per_request=self.connection.max_row_per_request,
                                                     max_delete_row=self.connection.max_delete_row,
-                                                    max_row_total_limit=self.connection.max_row_total_limit)
+                                                    max_row_total_limit=self.connection.max_row_total_limit,
+                                                    where_clause_cache=self.connection.where_clause_cache)
             return self.rowcount
 
         raise NotSupportedError(f"不支持的 SQL 语句类型: {statement.__class__.__name__}")
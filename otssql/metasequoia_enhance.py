@@ -3,7 +3,7 @@
 """
 
 import dataclasses
-from typing import List, Optional, Generator, Tuple, Set
+from typing import Any, List, Optional, Generator, Tuple, Set
 
 from metasequoia_sql import node
 
@@ -41,24 +41,25 @@ def iter_node_children(obj: object,
             yield from iter_node_children(item, path)
 
 
-def is_aggregation_query(statement: node.ASTSingleSelectStatement) -> bool:
+def is_aggregation_query(statement: node.ASTSingleSelectStatement,
+                         select_column_set: Optional["SelectColumnSet"] = None) -> bool:
     """判断 statement 是否为聚合查询语句
 
     Parameters
     ----------
     statement : node.ASTSingleSelectStatement
         SELECT 语句节点
+    select_column_set : Optional[SelectColumnSet], default = None
+        已经计算的 SELECT 子句字段清单，为 None 时根据 statement 计算
 
     Returns
     -------
     bool
         如果为聚合查询则返回 True，否则返回 False
     """
-    for column in statement.select_clause.columns:
-        for ast_node, _ in iter_node_children(column.value):
-            if isinstance(ast_node, node.ASTAggregationFunction):
-                return True
-    return False
+    if select_column_set is None:
+        select_column_set = get_select_column_set(statement.select_clause)
+    return len(select_column_set.aggregation_functions) > 0
 
 
 def get_aggregation_columns_in_node(ast_node: node.ASTBase) -> List[node.ASTColumnNameExpression]:
@@ -74,21 +75,10 @@ def get_aggregation_columns_in_node(ast_node: node.ASTBase) -> List[node.ASTColu
     List[node.ASTColumnNameExpression]
         ast_node 中聚集函数中的字段名节点的列表
     """
-    result = []
-
-    for ast_child, ast_path in iter_node_children(ast_node):
-
-        # 检查当前 AST 节点是否为字段名节点
-        if not isinstance(ast_child, node.ASTColumnNameExpression):
-            continue
-
-        # 检查当前 AST 节点的上级节点中是否包含聚集函数节点
-        for parent_node in ast_path:
-            if isinstance(parent_node, node.ASTAggregationFunction):
-                result.append(ast_child)
-                break
-
-    return result
+    # 字段名节点的上级节点中包含聚集函数节点时，即为聚合查询字段
+    return [ast_child for ast_child, ast_path in iter_node_children(ast_node)
+            if isinstance(ast_child, node.ASTColumnNameExpression)
+            and any(isinstance(parent_node, node.ASTAggregationFunction) for parent_node in ast_path)]
 
 
 def get_columns_in_node(ast_node: node.ASTBase) -> List[node.ASTColumnNameExpression]:
@@ -104,11 +94,8 @@ def get_columns_in_node(ast_node: node.ASTBase) -> List[node.ASTColumnNameExpres
     List[node.ASTColumnNameExpression]
         ast_node 中使用的字段列表
     """
-    result = []
-    for ast_child, _ in iter_node_children(ast_node):
-        if isinstance(ast_child, node.ASTColumnNameExpression):
-            result.append(ast_child)
-    return result
+    return [ast_child for ast_child, _ in iter_node_children(ast_node)
+            if isinstance(ast_child, node.ASTColumnNameExpression)]
 
 
 class SelectColumnSet:
@@ -180,8 +167,109 @@ def get_select_alias_set(select_clause: node.ASTSelectClause) -> Set[str]:
     Set[str]
         别名的集合
     """
-    alias_set = set()
-    for column in select_clause.columns:
-        if column.alias is not None:
-            alias_set.add(column.alias.name)
-    return alias_set
+    return {column.alias.name for column in select_clause.columns if column.alias is not None}
+
+
+def unquote_string(text: str) -> str:
+    """去除字符串字面值两侧的单引号（SQL 字符串字面值两侧各有且仅有一个引号，因此直接切片）
+
+    Parameters
+    ----------
+    text : str
+        字面值的源码
+
+    Returns
+    -------
+    str
+        去除两侧单引号后的字符串；如果不是字符串字面值则原样返回
+    """
+    if len(text) >= 2 and text[0] == "'" and text[-1] == "'":
+        return text[1:-1]
+    return text
+
+
+def unquote_source(ast_node: node.ASTBase) -> str:
+    """获取抽象语法树节点的源码，并去除字符串字面值两侧的单引号
+
+    Parameters
+    ----------
+    ast_node : node.ASTBase
+        抽象语法树节点
+
+    Returns
+    -------
+    str
+        去除两侧单引号后的源码
+    """
+    return unquote_string(ast_node.source())
+
+
+def get_literal_string(ast_node: node.ASTLiteralExpression) -> str:
+    """获取字面值节点去除两侧单引号后的字符串（直接读取解析器保存的 value 属性，不再调用 as_string 方法）
+
+    Parameters
+    ----------
+    ast_node : node.ASTLiteralExpression
+        字面值节点
+
+    Returns
+    -------
+    str
+        去除两侧单引号后的字面值
+    """
+    return unquote_string(ast_node.value)
+
+
+def get_literal_value(ast_node: node.ASTLiteralExpression) -> Any:
+    """获取字面值节点的 Python 值：字符串字面值返回去除两侧单引号后的字符串，其他字面值返回对应类型的值
+
+    Parameters
+    ----------
+    ast_node : node.ASTLiteralExpression
+        字面值节点
+
+    Returns
+    -------
+    Any
+        字面值的 Python 值（字符串、整数、浮点数、布尔值或 None）
+    """
+    if ast_node.value.startswith("'"):
+        return unquote_string(ast_node.value)
+    return ast_node.get_value()
+
+
+_SHAPE_END = object()  # 结构键中嵌套节点或列表结束的标记
+
+
+def get_node_shape(ast_node: node.ASTBase, literal_placeholder: Optional[str] = None) -> tuple:
+    """计算抽象语法树节点的结构键：按先序遍历依次记录节点类型和各属性的值（使用显式的栈，不受嵌套深度的限制）
+
+    Parameters
+    ----------
+    ast_node : node.ASTBase
+        抽象语法树节点
+    literal_placeholder : Optional[str], default = None
+        如果不为 None，则将所有字面值替换为该占位符，使仅字面值不同的节点具有相同的结构键
+
+    Returns
+    -------
+    tuple
+        可哈希的结构键；结构键相同的节点结构相同
+    """
+    shape = []
+    stack = [ast_node]
+    while stack:
+        obj = stack.pop()
+        if literal_placeholder is not None and isinstance(obj, node.ASTLiteralExpression):
+            shape.append(literal_placeholder)
+        elif isinstance(obj, node.ASTBase):
+            shape.append(type(obj))
+            stack.append(_SHAPE_END)
+            stack.extend(getattr(obj, field.name) for field in reversed(dataclasses.fields(obj)))
+        elif isinstance(obj, (list, tuple)):
+            shape.append(type(obj))
+            stack.append(_SHAPE_END)
+            stack.extend(reversed(obj))
+        else:
+            shape.append(obj)
+    return tuple(shape)
@@ -2,7 +2,13 @@
 基于 SDK API 的方法
 """
 
-from otssql.sdk_api.do_delete import do_one_delete_request, do_multi_delete
-from otssql.sdk_api.do_query import do_query, get_row, get_batch_row, get_range
-from otssql.sdk_api.do_update import do_one_update_request, do_multi_update
-from otssql.sdk_api.get_index_field_set import get_search_index_field_set, get_primary_key_field_list
+from otssql.sdk_api.do_delete import do_one_delete_request, do_multi_delete, do_multi_delete_async
+from otssql.sdk_api.do_query import (do_query, get_row, get_batch_row, get_range, search_pages, get_batch_row_pages,
+                                      get_range_pages)
+from otssql.sdk_api.do_query_async import do_query_async, get_row_async, get_batch_row_async, get_range_async
+from otssql.sdk_api.do_update import do_one_update_request, do_multi_update, do_multi_update_async
+from otssql.sdk_api.get_index_field_set import (get_search_index_name_list, get_search_index_field_set,
+                                                get_search_index_field_sets, get_search_index_column_map,
+                                                get_primary_key_field_list, get_primary_key_field_set,
+                                                invalidate_schema_cache)
+from otssql.sdk_api.pipelined_apply import pipelined_apply, iter_chunks, pipelined_apply_async, iter_chunks_async
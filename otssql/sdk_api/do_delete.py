@@ -2,33 +2,55 @@
 执行删除逻辑
 """
 
-from typing import Iterable
+import functools
+from typing import AsyncIterable, Iterable
 
 import tablestore
 
-__all__ = ["do_multi_delete", "do_one_delete_request"]
+from otssql.exceptions import DatabaseError
+from otssql.sdk_api.pipelined_apply import iter_chunks, iter_chunks_async, pipelined_apply, pipelined_apply_async
 
+__all__ = ["do_multi_delete", "do_multi_delete_async", "do_one_delete_request"]
+
+_BATCH_WRITE_ROW_MAX_ROWS = 200  # 单次 BatchWriteRow 请求最多写入的行数
+
+
+def do_multi_delete(ots_client: tablestore.OTSClient, table_name: str, primary_key_list: Iterable[tuple],
+                    max_pending_requests: int = 2) -> int:
+    """执行多条删除：将 table_name 中 primary_key_list 中主键对应的记录删除
+
+    primary_key_list 可以是迭代器：每累积 _BATCH_WRITE_ROW_MAX_ROWS 个主键发送一次请求，不需要预先获取所有主键；删除请求在后台线程中执行，
+    等待删除完成的同时继续获取后续的主键（最多同时执行 max_pending_requests 个请求）
+    """
+    row_items = (tablestore.DeleteRowItem(tablestore.Row(primary_key),
+                                          tablestore.Condition(tablestore.RowExistenceExpectation.IGNORE))  # TODO 待改为参数
+                 for primary_key in primary_key_list)
 
-def do_multi_delete(ots_client: tablestore.OTSClient, table_name: str, primary_key_list: Iterable[tuple]) -> int:
-    """执行多条删除：将 table_name 中 primary_key_list 中主键对应的记录删除"""
     n_change = 0
-    row_items = []
-    for primary_key in primary_key_list:
-        row = tablestore.Row(primary_key)
-        condition = tablestore.Condition(tablestore.RowExistenceExpectation.IGNORE)  # TODO 待改为参数
-        row_items.append(tablestore.DeleteRowItem(row, condition))
+    for n_success in pipelined_apply(functools.partial(do_one_delete_request, ots_client, table_name),
+                                     iter_chunks(row_items, _BATCH_WRITE_ROW_MAX_ROWS),
+                                     max_pending_requests=max_pending_requests):
+        n_change += n_success
+    return n_change
 
-        if len(row_items) >= 200:
-            n_change += do_one_delete_request(ots_client, table_name, row_items)
-            row_items = []
 
-    if len(row_items) >= 1:
-        n_change += do_one_delete_request(ots_client, table_name, row_items)
+async def do_multi_delete_async(ots_client: tablestore.OTSClient, table_name: str,
+                                primary_key_list: AsyncIterable[tuple],
+                                max_pending_requests: int = 2) -> int:
+    """do_multi_delete 的异步版本：从异步迭代器中获取主键，删除请求通过 asyncio.to_thread 在线程中执行"""
+    row_items = (tablestore.DeleteRowItem(tablestore.Row(primary_key),
+                                          tablestore.Condition(tablestore.RowExistenceExpectation.IGNORE))  # TODO 待改为参数
+                 async for primary_key in primary_key_list)
 
+    n_change = 0
+    async for n_success in pipelined_apply_async(functools.partial(do_one_delete_request, ots_client, table_name),
+                                                 iter_chunks_async(row_items, _BATCH_WRITE_ROW_MAX_ROWS),
+                                                 max_pending_requests=max_pending_requests):
+        n_change += n_success
     return n_change
 
 
-def do_one_delete_request(ots_client: tablestore.OTSClient, table_name: str, row_items: list):
+def do_one_delete_request(ots_client: tablestore.OTSClient, table_name: str, row_items: list) -> int:
     """执行一次批量更新请求
 
     在删除记录时，无论成功与否，success_res 和 fail_res 均为空，
@@ -46,11 +68,11 @@ def do_one_delete_request(ots_client: tablestore.OTSClient, table_name: str, row
             print(f"脏数据更新失败: error_code={item.error_code}, error_message={item.error_message}")
         return len(success_res)
 
-    # 客户端异常，一般为参数错误或者网络异常。
+    # 客户端异常，一般为参数错误或者网络异常；请求失败时不继续处理后续批次，将异常抛出给调用方
     except tablestore.OTSClientError as e:
-        print("get row failed, http_status:%d, error_message:%s" % (
-            e.get_http_status(), e.get_error_message()))
+        raise DatabaseError(f"批量删除请求失败: http_status={e.get_http_status()}, "
+                            f"error_message={e.get_error_message()}") from e
     # 服务端异常，一般为参数错误或者流控错误。
     except tablestore.OTSServiceError as e:
-        print("get row failed, http_status:%d, error_code:%s, error_message:%s, request_id:%s" % (
-            e.get_http_status(), e.get_error_code(), e.get_error_message(), e.get_request_id()))
+        raise DatabaseError(f"批量删除请求失败: http_status={e.get_http_status()}, error_code={e.get_error_code()}, "
+                            f"error_message={e.get_error_message()}, request_id={e.get_request_id()}") from e
@@ -2,7 +2,9 @@
 执行查询逻辑
 """
 
-from typing import Generator, List, Union
+import concurrent.futures
+import itertools
+from typing import Generator, List, Optional, Union
 
 import tablestore
 
@@ -11,14 +13,24 @@ from otssql import convert
 from otssql.exceptions import NotSupportedError
 from otssql.objects import IndexType, UseIndex
 
-__all__ = ["do_query", "get_row", "get_batch_row", "get_range"]
+__all__ = ["do_query", "get_row", "get_batch_row", "get_range",
+           "search_pages", "get_batch_row_pages", "get_range_pages"]
+
+_BATCH_GET_ROW_MAX_ROWS = 100  # 【Tablestore SDK 常量】单次 BatchGetRow 请求最多读取的行数
+
+# 预先绑定热路径中比较的索引类型，避免每次比较时在 IndexType 上查找枚举成员
+_SEARCH_INDEX = IndexType.SEARCH_INDEX
+_PRIMARY_KEY_GET = IndexType.PRIMARY_KEY_GET
+_PRIMARY_KEY_BATCH = IndexType.PRIMARY_KEY_BATCH
 
 
 def do_query(ots_client: tablestore.OTSClient, table_name: str, use_index: UseIndex,
              statement: Union[node.ASTSingleSelectStatement, node.ASTUpdateStatement, node.ASTDeleteStatement],
              offset: int, limit: int,
              return_type: tablestore.ColumnReturnType,
-             max_row_per_request: int
+             max_row_per_request: int,
+             where_clause_cache: bool = False,
+             prefetch: bool = True
              ) -> Generator[tuple, None, None]:
     """执行查询，并 yield 每一个生产结果
 
@@ -40,26 +52,31 @@ def do_query(ots_client: tablestore.OTSClient, table_name: str, use_index: UseIn
         OTS 的返回类型
     max_row_per_request : int
         【Tablestore SDK】每次 tablestore 请求获取的记录数
+    where_clause_cache : bool, default = False
+        是否使用 WHERE 子句的编译缓存
+    prefetch : bool, default = True
+        是否在返回当前页结果的同时，在后台线程中预先请求下一页结果（仅多元索引查询和主键范围查询使用）
 
     Yields
     ------
     tuple
         每个字段的信息
     """
-    if use_index.index_type == IndexType.SEARCH_INDEX:
-        query = convert.convert_where_clause(statement.where_clause)
+    index_type = use_index.index_type
+    if index_type == _SEARCH_INDEX:
+        query = convert.convert_where_clause(statement.where_clause, use_cache=where_clause_cache)
         sort = convert.convert_order_by_clause(statement.order_by_clause)
         yield from search(
             ots_client=ots_client, table_name=table_name, index_name=use_index.index_name,
             query=query, sort=sort, offset=offset, limit=limit,
-            return_type=return_type, max_row_per_request=max_row_per_request)
-    elif use_index.index_type == IndexType.PRIMARY_KEY_GET:
+            return_type=return_type, max_row_per_request=max_row_per_request, prefetch=prefetch)
+    elif index_type == _PRIMARY_KEY_GET:
         yield from get_row(
-            ots_client=ots_client, table_name=table_name, primary_key=use_index.primary_key
+            ots_client=ots_client, table_name=table_name, primary_key=use_index.primary_key, limit=limit
         )
-    elif use_index.index_type == IndexType.PRIMARY_KEY_BATCH:
+    elif index_type == _PRIMARY_KEY_BATCH:
         yield from get_batch_row(
-            ots_client=ots_client, table_name=table_name, rows_to_get=use_index.rows_to_get
+            ots_client=ots_client, table_name=table_name, rows_to_get=use_index.rows_to_get, limit=limit
         )
     else:  # use_index.index_type = IndexType.PRIMARY_KEY_RANGE
         yield from get_range(
@@ -67,14 +84,15 @@ def do_query(ots_client: tablestore.OTSClient, table_name: str, use_index: UseIn
             inclusive_start_primary_key=use_index.start_key,
             exclusive_end_primary_key=use_index.end_key,
             offset=offset, limit=limit,
-            max_row_per_request=max_row_per_request
+            max_row_per_request=max_row_per_request, prefetch=prefetch
         )
 
 
 def search(ots_client: tablestore.OTSClient, table_name: str, index_name: str,
            query: tablestore.Query, sort: tablestore.Sort, offset: int, limit: int,
            return_type: tablestore.ColumnReturnType,
-           max_row_per_request: int
+           max_row_per_request: int,
+           prefetch: bool = True
            ) -> Generator[tuple, None, None]:
     """执行查询，并 yield 每一个生产结果
 
@@ -98,43 +116,84 @@ def search(ots_client: tablestore.OTSClient, table_name: str, index_name: str,
         OTS 的返回类型
     max_row_per_request : int
         【Tablestore SDK】每次 tablestore 请求获取的记录数
+    prefetch : bool, default = True
+        是否在返回当前页结果的同时，在后台线程中预先请求下一页结果
 
     Yields
     ------
     tuple
         每个字段的信息
     """
+    yield from itertools.chain.from_iterable(search_pages(
+        ots_client=ots_client, table_name=table_name, index_name=index_name,
+        query=query, sort=sort, offset=offset, limit=limit,
+        return_type=return_type, max_row_per_request=max_row_per_request, prefetch=prefetch))
+
+
+def search_pages(ots_client: tablestore.OTSClient, table_name: str, index_name: str,
+                 query: tablestore.Query, sort: tablestore.Sort, offset: int, limit: int,
+                 return_type: tablestore.ColumnReturnType,
+                 max_row_per_request: int,
+                 prefetch: bool = True
+                 ) -> Generator[List[tuple], None, None]:
+    """执行多元索引查询，并逐页 yield 每一页的结果列表（参数与 search 相同）
+
+    同步版本和异步版本共用的分页逻辑：异步版本在线程中逐页获取结果
+
+    Yields
+    ------
+    List[tuple]
+        每一页的结果列表（已按 limit 截断）
+    """
+    columns_to_get = tablestore.ColumnsToGet(return_type=return_type)  # 各页请求的返回字段相同，共用同一个对象
+    search_fn = ots_client.search  # 预先绑定每页请求使用的方法，减少每页的属性查找
+
+    def search_next_page(next_token: bytes, page_limit: int) -> tablestore.metadata.SearchResponse:
+        """请求下一页的查询结果"""
+        return search_fn(
+            table_name, index_name,
+            tablestore.SearchQuery(query, next_token=next_token, limit=page_limit),
+            columns_to_get
+        )
 
-    n_yield = 0
+    remaining = limit  # 还需要返回的记录数
 
     # 执行第一次查询
-    search_response: tablestore.metadata.SearchResponse = ots_client.search(
+    search_response: tablestore.metadata.SearchResponse = search_fn(
         table_name, index_name,
-        tablestore.SearchQuery(query, sort=sort, offset=offset, limit=min(limit, max_row_per_request)),
-        tablestore.ColumnsToGet(return_type=return_type)
+        tablestore.SearchQuery(query, sort=sort, offset=offset, limit=min(remaining, max_row_per_request)),
+        columns_to_get
     )
-    for row in search_response.rows:
-        yield row
-        n_yield += 1
-        if n_yield >= limit:
-            return
-
-    # 继续执行后续查询，直至查询完成
-    while search_response.next_token:
-        search_response: tablestore.metadata.SearchResponse = ots_client.search(
-            table_name, index_name,
-            tablestore.SearchQuery(query, next_token=search_response.next_token, limit=max_row_per_request),
-            tablestore.ColumnsToGet(return_type=return_type)
-        )
-        for row in search_response.rows:
-            yield row
-            n_yield += 1
-            if n_yield >= limit:
+
+    # 逐页返回结果，直至查询完成或达到 limit 的限制
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1) if prefetch is True else None
+    try:
+        while True:
+            page_size = min(len(search_response.rows), remaining)
+            remaining -= page_size
+            next_token = search_response.next_token if remaining > 0 else None
+
+            # 在返回当前页的结果之前，先在后台线程中请求下一页
+            next_page_future = None
+            if next_token and executor is not None:
+                next_page_future = executor.submit(search_next_page, next_token, min(remaining, max_row_per_request))
+
+            yield search_response.rows[:page_size]
+
+            if not next_token:
                 return
+            if next_page_future is not None:
+                search_response = next_page_future.result()
+            else:
+                search_response = search_next_page(next_token, min(remaining, max_row_per_request))
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
 
 
 def get_row(ots_client: tablestore.OTSClient, table_name: str, primary_key: List[tuple],
-            max_version: int = 1
+            max_version: int = 1,
+            limit: Optional[int] = None
             ) -> Generator[tuple, None, None]:
     """使用主键索引执行单行查询
 
@@ -150,22 +209,28 @@ def get_row(ots_client: tablestore.OTSClient, table_name: str, primary_key: List
         主键值
     max_version : int, default = 1
         最多读取的版本数
+    limit : Optional[int], default = None
+        LIMIT 子句中的 LIMIT，为 None 时不限制
 
     Yields
     ------
     tuple
         每个字段的信息
     """
+    if limit is not None and limit <= 0:
+        return
+
     consumed, return_row, next_token = ots_client.get_row(
         table_name=table_name,
         primary_key=primary_key,
         max_version=max_version
     )
-    yield [return_row.primary_key, return_row.attribute_columns]
+    yield (return_row.primary_key, return_row.attribute_columns)
 
 
 def get_batch_row(ots_client: tablestore.OTSClient, table_name: str, rows_to_get: List[List[tuple]],
-                  max_version: int = 1
+                  max_version: int = 1,
+                  limit: Optional[int] = None
                   ) -> Generator[tuple, None, None]:
     """使用主键索引执行批量查询
 
@@ -181,25 +246,67 @@ def get_batch_row(ots_client: tablestore.OTSClient, table_name: str, rows_to_get
         主键值的列表
     max_version : int, default = 1
         最多读取的版本数
+    limit : Optional[int], default = None
+        LIMIT 子句中的 LIMIT，为 None 时不限制
 
     Yields
     ------
     tuple
         每个字段的信息
     """
+    yield from itertools.chain.from_iterable(get_batch_row_pages(
+        ots_client=ots_client, table_name=table_name, rows_to_get=rows_to_get, max_version=max_version, limit=limit))
+
+
+def get_batch_row_pages(ots_client: tablestore.OTSClient, table_name: str, rows_to_get: List[List[tuple]],
+                        max_version: int = 1,
+                        limit: Optional[int] = None
+                        ) -> Generator[List[tuple], None, None]:
+    """使用主键索引执行批量查询，并按主键列表的顺序逐个 yield 每一次 BatchGetRow 请求的结果列表（参数与 get_batch_row 相同）
+
+    同步版本和异步版本共用的拆分请求逻辑：异步版本在线程中逐个获取结果
+
+    Yields
+    ------
+    List[tuple]
+        每一次 BatchGetRow 请求的结果列表
+    """
+    if limit is not None:
+        rows_to_get = rows_to_get[:limit]  # 超过 LIMIT 的主键不需要请求
+    if not rows_to_get:
+        return
+
+    # 单次 BatchGetRow 请求最多读取 100 行，超过时拆分为多个请求，并在线程池中同时执行
+    chunks = [rows_to_get[i:i + _BATCH_GET_ROW_MAX_ROWS] for i in range(0, len(rows_to_get), _BATCH_GET_ROW_MAX_ROWS)]
+    if len(chunks) <= 1:
+        yield _batch_get_chunk(ots_client, table_name, rows_to_get, max_version)
+        return
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(chunks)))
+    try:
+        futures = [executor.submit(_batch_get_chunk, ots_client, table_name, chunk, max_version) for chunk in chunks]
+        for future in futures:  # 按主键列表的顺序返回结果
+            yield future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _batch_get_chunk(ots_client: tablestore.OTSClient, table_name: str, rows_to_get: List[List[tuple]],
+                     max_version: int) -> List[tuple]:
+    """执行一次 BatchGetRow 请求，返回读取到的记录列表"""
     request = tablestore.BatchGetRowRequest()
     request.add(tablestore.TableInBatchGetRowItem(table_name, primary_keys=rows_to_get, max_version=max_version))
     result = ots_client.batch_get_row(request)
     table_result = result.get_result_by_table(table_name)
-    for item in table_result:
-        yield [item.row.primary_key, item.row.attribute_columns]
+    return [(item.row.primary_key, item.row.attribute_columns) for item in table_result]
 
 
 def get_range(ots_client: tablestore.OTSClient, table_name: str,
               inclusive_start_primary_key: List[tuple],
               exclusive_end_primary_key: List[tuple],
               offset: int, limit: int,
-              max_row_per_request: int
+              max_row_per_request: int,
+              prefetch: bool = True
               ) -> Generator[tuple, None, None]:
     """使用主键索引的范围查询功能
 
@@ -221,47 +328,85 @@ def get_range(ots_client: tablestore.OTSClient, table_name: str,
         LIMIT 子句中的 LIMIT
     max_row_per_request : int
         【Tablestore SDK】每次 tablestore 请求获取的记录数
+    prefetch : bool, default = True
+        是否在返回当前页结果的同时，在后台线程中预先请求下一页结果
 
     Yields
     ------
     tuple
         每个字段的信息
     """
+    yield from itertools.chain.from_iterable(get_range_pages(
+        ots_client=ots_client, table_name=table_name,
+        inclusive_start_primary_key=inclusive_start_primary_key,
+        exclusive_end_primary_key=exclusive_end_primary_key,
+        offset=offset, limit=limit,
+        max_row_per_request=max_row_per_request, prefetch=prefetch))
 
-    if offset != 0:
-        raise NotSupportedError("主键索引不支持设置 LIMIT 子句的 offset")
 
-    n_yield = 0
+def get_range_pages(ots_client: tablestore.OTSClient, table_name: str,
+                    inclusive_start_primary_key: List[tuple],
+                    exclusive_end_primary_key: List[tuple],
+                    offset: int, limit: int,
+                    max_row_per_request: int,
+                    prefetch: bool = True
+                    ) -> Generator[List[tuple], None, None]:
+    """使用主键索引的范围查询功能，并逐页 yield 每一页的结果列表（参数与 get_range 相同）
 
-    # 执行第一次查询
-    consumed, next_start_primary_key, row_list, next_token = ots_client.get_range(
-        table_name=table_name,
-        direction=tablestore.Direction.FORWARD,
-        inclusive_start_primary_key=inclusive_start_primary_key,
-        exclusive_end_primary_key=exclusive_end_primary_key,
-        limit=max_row_per_request,
-        max_version=1,
-    )
+    同步版本和异步版本共用的分页逻辑：异步版本在线程中逐页获取结果
 
-    for row in row_list:
-        yield [row.primary_key, row.attribute_columns]
-        n_yield += 1
-        if n_yield >= limit:
-            return
+    Yields
+    ------
+    List[tuple]
+        每一页的结果列表（已按 limit 截断）
+    """
+    if offset != 0:
+        raise NotSupportedError("主键索引不支持设置 LIMIT 子句的 offset")
+
+    get_range_fn = ots_client.get_range  # 预先绑定每页请求使用的方法和常量，减少每页的属性查找
+    forward = tablestore.Direction.FORWARD
 
-    # 继续执行后续查询，直至查询完成
-    while next_start_primary_key is not None:
-        inclusive_start_primary_key = next_start_primary_key
-        consumed, next_start_primary_key, row_list, next_token = ots_client.get_range(
+    def get_range_page(start_primary_key: List[tuple], page_limit: int) -> tuple:
+        """请求从 start_primary_key 开始的一页查询结果"""
+        return get_range_fn(
             table_name=table_name,
-            direction=tablestore.Direction.FORWARD,
-            inclusive_start_primary_key=inclusive_start_primary_key,
+            direction=forward,
+            inclusive_start_primary_key=start_primary_key,
             exclusive_end_primary_key=exclusive_end_primary_key,
-            limit=max_row_per_request,
+            limit=page_limit,
             max_version=1,
         )
-        for row in row_list:
-            yield [row.primary_key, row.attribute_columns]
-            n_yield += 1
-            if n_yield >= limit:
+
+    remaining = limit  # 还需要返回的记录数
+
+    # 执行第一次查询
+    consumed, next_start_primary_key, row_list, next_token = get_range_page(
+        inclusive_start_primary_key, min(remaining, max_row_per_request))
+
+    # 逐页返回结果，直至查询完成或达到 limit 的限制
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1) if prefetch is True else None
+    try:
+        while True:
+            page_size = min(len(row_list), remaining)
+            remaining -= page_size
+            if remaining <= 0:
+                next_start_primary_key = None
+
+            # 在返回当前页的结果之前，先在后台线程中请求下一页
+            next_page_future = None
+            if next_start_primary_key is not None and executor is not None:
+                next_page_future = executor.submit(get_range_page, next_start_primary_key,
+                                                   min(remaining, max_row_per_request))
+
+            yield [(row.primary_key, row.attribute_columns) for row in itertools.islice(row_list, page_size)]
+
+            if next_start_primary_key is None:
                 return
+            if next_page_future is not None:
+                consumed, next_start_primary_key, row_list, next_token = next_page_future.result()
+            else:
+                consumed, next_start_primary_key, row_list, next_token = get_range_page(
+                    next_start_primary_key, min(remaining, max_row_per_request))
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,253 @@
+"""
+执行查询逻辑（异步版本）
+
+复用同步版本的分页逻辑，每一页结果均通过 asyncio.to_thread 在线程中获取，使调用方可以使用 asyncio.gather 同时执行多个查询
+"""
+
+import asyncio
+from typing import AsyncGenerator, Generator, List, Optional, Union
+
+import tablestore
+
+from metasequoia_sql import node
+from otssql import convert
+from otssql.objects import IndexType, UseIndex
+from otssql.sdk_api.do_query import get_batch_row_pages, get_range_pages, get_row, search_pages
+
+__all__ = ["do_query_async", "get_row_async", "get_batch_row_async", "get_range_async"]
+
+# 预先绑定热路径中比较的索引类型，避免每次比较时在 IndexType 上查找枚举成员
+_SEARCH_INDEX = IndexType.SEARCH_INDEX
+_PRIMARY_KEY_GET = IndexType.PRIMARY_KEY_GET
+_PRIMARY_KEY_BATCH = IndexType.PRIMARY_KEY_BATCH
+
+
+async def do_query_async(ots_client: tablestore.OTSClient, table_name: str, use_index: UseIndex,
+                         statement: Union[node.ASTSingleSelectStatement, node.ASTUpdateStatement,
+                                          node.ASTDeleteStatement],
+                         offset: int, limit: int,
+                         return_type: tablestore.ColumnReturnType,
+                         max_row_per_request: int,
+                         where_clause_cache: bool = False,
+                         prefetch: bool = True
+                         ) -> AsyncGenerator[tuple, None]:
+    """异步执行查询，并 yield 每一个生产结果
+
+    Parameters
+    ----------
+    ots_client : tablestore.OTSClient
+        OTS 客户端
+    table_name : str
+        OTS 表名
+    use_index : UseIndex
+        使用索引
+    statement : ASTBase
+        SQL 语句
+    offset : int
+        LIMIT 子句中的 OFFSET
+    limit : int
+        LIMIT 子句中的 LIMIT
+    return_type : tablestore.ColumnReturnType
+        OTS 的返回类型
+    max_row_per_request : int
+        【Tablestore SDK】每次 tablestore 请求获取的记录数
+    where_clause_cache : bool, default = False
+        是否使用 WHERE 子句的编译缓存
+    prefetch : bool, default = True
+        是否在返回当前页结果的同时，预先请求下一页结果（仅多元索引查询和主键范围查询使用）
+
+    Yields
+    ------
+    tuple
+        每个字段的信息
+    """
+    index_type = use_index.index_type
+    if index_type == _SEARCH_INDEX:
+        query = convert.convert_where_clause(statement.where_clause, use_cache=where_clause_cache)
+        sort = convert.convert_order_by_clause(statement.order_by_clause)
+        rows = search_async(
+            ots_client=ots_client, table_name=table_name, index_name=use_index.index_name,
+            query=query, sort=sort, offset=offset, limit=limit,
+            return_type=return_type, max_row_per_request=max_row_per_request, prefetch=prefetch)
+    elif index_type == _PRIMARY_KEY_GET:
+        rows = get_row_async(
+            ots_client=ots_client, table_name=table_name, primary_key=use_index.primary_key, limit=limit
+        )
+    elif index_type == _PRIMARY_KEY_BATCH:
+        rows = get_batch_row_async(
+            ots_client=ots_client, table_name=table_name, rows_to_get=use_index.rows_to_get, limit=limit
+        )
+    else:  # use_index.index_type = IndexType.PRIMARY_KEY_RANGE
+        rows = get_range_async(
+            ots_client=ots_client, table_name=table_name,
+            inclusive_start_primary_key=use_index.start_key,
+            exclusive_end_primary_key=use_index.end_key,
+            offset=offset, limit=limit,
+            max_row_per_request=max_row_per_request, prefetch=prefetch
+        )
+    async for row in rows:
+        yield row
+
+
+async def search_async(ots_client: tablestore.OTSClient, table_name: str, index_name: str,
+                       query: tablestore.Query, sort: tablestore.Sort, offset: int, limit: int,
+                       return_type: tablestore.ColumnReturnType,
+                       max_row_per_request: int,
+                       prefetch: bool = True
+                       ) -> AsyncGenerator[tuple, None]:
+    """异步执行多元索引查询，并 yield 每一个生产结果
+
+    Parameters
+    ----------
+    ots_client : tablestore.OTSClient
+        OTS 客户端
+    table_name : str
+        OTS 表名
+    index_name : str
+        OTS 索引名
+    query : tablestore.Query
+        OTS 查询规则（相当于 WHERE 子句）
+    sort : tablestore.Sort
+        OTS 排序规则（相当于 ORDER BY 子句）
+    offset : int
+        LIMIT 子句中的 OFFSET
+    limit : int
+        LIMIT 子句中的 LIMIT
+    return_type : tablestore.ColumnReturnType
+        OTS 的返回类型
+    max_row_per_request : int
+        【Tablestore SDK】每次 tablestore 请求获取的记录数
+    prefetch : bool, default = True
+        是否在返回当前页结果的同时，预先请求下一页结果
+
+    Yields
+    ------
+    tuple
+        每个字段的信息
+    """
+    async for row in _iter_pages_async(search_pages(
+            ots_client=ots_client, table_name=table_name, index_name=index_name,
+            query=query, sort=sort, offset=offset, limit=limit,
+            return_type=return_type, max_row_per_request=max_row_per_request, prefetch=prefetch)):
+        yield row
+
+
+async def get_row_async(ots_client: tablestore.OTSClient, table_name: str, primary_key: List[tuple],
+                        max_version: int = 1,
+                        limit: Optional[int] = None
+                        ) -> AsyncGenerator[tuple, None]:
+    """异步使用主键索引执行单行查询
+
+    Parameters
+    ----------
+    ots_client : tablestore.OTSClient
+        OTS 客户端
+    table_name : str
+        OTS 表名
+    primary_key : List[tuple]
+        主键值
+    max_version : int, default = 1
+        最多读取的版本数
+    limit : Optional[int], default = None
+        LIMIT 子句中的 LIMIT，为 None 时不限制
+
+    Yields
+    ------
+    tuple
+        每个字段的信息
+    """
+    rows = await asyncio.to_thread(list, get_row(ots_client, table_name, primary_key,
+                                                 max_version=max_version, limit=limit))
+    for row in rows:
+        yield row
+
+
+async def get_batch_row_async(ots_client: tablestore.OTSClient, table_name: str, rows_to_get: List[List[tuple]],
+                              max_version: int = 1,
+                              limit: Optional[int] = None
+                              ) -> AsyncGenerator[tuple, None]:
+    """异步使用主键索引执行批量查询
+
+    Parameters
+    ----------
+    ots_client : tablestore.OTSClient
+        OTS 客户端
+    table_name : str
+        OTS 表名
+    rows_to_get : List[List[tuple]]
+        主键值的列表
+    max_version : int, default = 1
+        最多读取的版本数
+    limit : Optional[int], default = None
+        LIMIT 子句中的 LIMIT，为 None 时不限制
+
+    Yields
+    ------
+    tuple
+        每个字段的信息
+    """
+    # 拆分后的各个 BatchGetRow 请求在 get_batch_row_pages 的线程池中同时执行，同时执行的请求数与同步版本相同（最多 8 个）
+    async for row in _iter_pages_async(get_batch_row_pages(
+            ots_client=ots_client, table_name=table_name, rows_to_get=rows_to_get, max_version=max_version,
+            limit=limit)):
+        yield row
+
+
+async def get_range_async(ots_client: tablestore.OTSClient, table_name: str,
+                          inclusive_start_primary_key: List[tuple],
+                          exclusive_end_primary_key: List[tuple],
+                          offset: int, limit: int,
+                          max_row_per_request: int,
+                          prefetch: bool = True
+                          ) -> AsyncGenerator[tuple, None]:
+    """异步使用主键索引的范围查询功能
+
+    Parameters
+    ----------
+    ots_client : tablestore.OTSClient
+        OTS 客户端
+    table_name : str
+        OTS 表名
+    inclusive_start_primary_key : List[tuple]
+        起始主键
+    exclusive_end_primary_key : List[tuple]
+        结束主键
+    offset : int
+        LIMIT 子句中的 OFFSET
+    limit : int
+        LIMIT 子句中的 LIMIT
+    max_row_per_request : int
+        【Tablestore SDK】每次 tablestore 请求获取的记录数
+    prefetch : bool, default = True
+        是否在返回当前页结果的同时，预先请求下一页结果
+
+    Yields
+    ------
+    tuple
+        每个字段的信息
+    """
+    async for row in _iter_pages_async(get_range_pages(
+            ots_client=ots_client, table_name=table_name,
+            inclusive_start_primary_key=inclusive_start_primary_key,
+            exclusive_end_primary_key=exclusive_end_primary_key,
+            offset=offset, limit=limit,
+            max_row_per_request=max_row_per_request, prefetch=prefetch)):
+        yield row
+
+
+async def _iter_pages_async(pages: Generator[List[tuple], None, None]) -> AsyncGenerator[tuple, None]:
+    """在线程中逐页获取同步分页生成器的结果，并 yield 每一行结果；提前结束时关闭分页生成器"""
+    next_page_task: Optional[asyncio.Future] = None
+    try:
+        while True:
+            next_page_task = asyncio.ensure_future(asyncio.to_thread(next, pages, None))
+            page = await next_page_task
+            next_page_task = None
+            if page is None:
+                return
+            for row in page:
+                yield row
+    finally:
+        if next_page_task is not None:
+            await asyncio.wait([next_page_task])  # 线程中的 next 无法取消，等待其执行完成后再关闭分页生成器
+        pages.close()
@@ -1,44 +1,213 @@
 """
 获取 tablestore 多元索引和主键索引中包含的字段清单
+
+表结构和多元索引结构很少变化，因此在有效期内缓存查询结果，避免每条 SQL 语句都重复请求；表结构变化后可以调用
+invalidate_schema_cache 清除缓存
 """
 
-from typing import Set, List
+import concurrent.futures
+import threading
+import time
+import weakref
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
 import tablestore
 
 from otssql.exceptions import ProgrammingError
 
-__all__ = ["get_search_index_field_set", "get_primary_key_field_list"]
+__all__ = ["get_search_index_name_list", "get_search_index_field_set", "get_search_index_field_sets",
+           "get_search_index_column_map", "get_primary_key_field_list",
+           "get_primary_key_field_set", "invalidate_schema_cache"]
+
+_SCHEMA_CACHE_TTL = 300.0  # 表结构和多元索引结构缓存的有效期（秒）
+
+# 缓存按 OTS 客户端弱引用分组（客户端被回收后自动清除，不会因 id 复用而命中其他客户端的缓存）；
+# 每个客户端的缓存的键为 (table_name, ...)，值为 (缓存时间, 结果)
+_SEARCH_INDEX_NAME_LIST_CACHE = weakref.WeakKeyDictionary()  # (table_name,) -> 多元索引名称列表
+_SEARCH_INDEX_FIELD_SET_CACHE = weakref.WeakKeyDictionary()  # (table_name, index_name) -> 多元索引的字段清单
+_SEARCH_INDEX_FIELD_SETS_CACHE = weakref.WeakKeyDictionary()  # (table_name,) -> (多元索引名称列表, 字段清单, 倒排索引)
+_PRIMARY_KEY_FIELD_CACHE = weakref.WeakKeyDictionary()  # (table_name,) -> (主键字段列表, 主键字段集合)
+
+# 读写缓存时持有的锁（并发请求多元索引字段清单的线程会同时写入缓存）；请求 Tablestore 时不持有锁
+_SCHEMA_CACHE_LOCK = threading.Lock()
+
+
+def get_search_index_name_list(ots_client: tablestore.OTSClient,
+                               table_name: str) -> List[str]:
+    """获取 TableStore 表的多元索引名称列表"""
+    cache_key = (table_name,)
+    cached = _get_cache(_SEARCH_INDEX_NAME_LIST_CACHE, ots_client, cache_key)
+    if cached is not None:
+        return cached
+
+    index_name_list = [index_name for _, index_name in ots_client.list_search_index(table_name)]
+    _set_cache(_SEARCH_INDEX_NAME_LIST_CACHE, ots_client, cache_key, index_name_list)
+    return index_name_list
 
 
 def get_search_index_field_set(ots_client: tablestore.OTSClient,
                                table_name: str,
                                index_name: str) -> Set[str]:
     """获取 TableStore 多元索引中包含的字段清单"""
+    cache_key = (table_name, index_name)
+    cached = _get_cache(_SEARCH_INDEX_FIELD_SET_CACHE, ots_client, cache_key)
+    if cached is not None:
+        return cached
+
     # 获取多元索引的信息
     index_meta: tablestore.metadata.SearchIndexMeta
     sync_stat: tablestore.metadata.SyncStat
     index_meta, sync_stat = ots_client.describe_search_index(table_name, index_name)
 
     # 获取多元索引的字段列表
-    field_set = set()
-    field: tablestore.metadata.FieldSchema
-    for field in index_meta.fields:
-        field_set.add(field.field_name)
+    field_set = {field.field_name for field in index_meta.fields}
+    _set_cache(_SEARCH_INDEX_FIELD_SET_CACHE, ots_client, cache_key, field_set)
     return field_set
 
 
+def get_search_index_field_sets(ots_client: tablestore.OTSClient,
+                                table_name: str) -> List[Tuple[str, Set[str]]]:
+    """获取 TableStore 表的所有多元索引及其包含的字段清单
+
+    没有缓存时，同时请求各个多元索引的字段清单，使首次查询的耗时接近单次请求的耗时，而不是所有请求的耗时之和
+
+    Parameters
+    ----------
+    ots_client : tablestore.OTSClient
+        OTS 客户端
+    table_name : str
+        表名
+
+    Returns
+    -------
+    List[Tuple[str, Set[str]]]
+        按多元索引列表顺序排列的 (多元索引名称, 字段清单) 的列表
+    """
+    return _get_search_index_field_sets(ots_client, table_name)[1]
+
+
+def get_search_index_column_map(ots_client: tablestore.OTSClient,
+                                table_name: str) -> Dict[str, FrozenSet[str]]:
+    """获取 TableStore 表的字段到包含该字段的多元索引名称集合的映射（倒排索引）
+
+    与所有多元索引的字段清单一起构造和缓存，选择多元索引时对所需字段的多元索引集合求交集，即可得到包含所有所需字段的多元索引
+
+    Parameters
+    ----------
+    ots_client : tablestore.OTSClient
+        OTS 客户端
+    table_name : str
+        表名
+
+    Returns
+    -------
+    Dict[str, FrozenSet[str]]
+        字段名到包含该字段的多元索引名称集合的映射
+    """
+    return _get_search_index_field_sets(ots_client, table_name)[2]
+
+
+def _get_search_index_field_sets(ots_client: tablestore.OTSClient,
+                                 table_name: str
+                                 ) -> Tuple[List[str], List[Tuple[str, Set[str]]], Dict[str, FrozenSet[str]]]:
+    """获取 TableStore 表的多元索引名称列表、所有多元索引的字段清单和字段到多元索引的倒排索引
+
+    多元索引名称列表刷新后（缓存过期或被清除）重新构造，使字段清单和倒排索引不会比多元索引名称列表更旧
+    """
+    index_name_list = get_search_index_name_list(ots_client, table_name)
+    cache_key = (table_name,)
+    cached = _get_cache(_SEARCH_INDEX_FIELD_SETS_CACHE, ots_client, cache_key)
+    if cached is not None and cached[0] is index_name_list:
+        return cached
+
+    if len(index_name_list) > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(index_name_list))) as executor:
+            index_field_sets = list(executor.map(
+                lambda index_name: get_search_index_field_set(ots_client, table_name, index_name), index_name_list))
+    else:
+        index_field_sets = [get_search_index_field_set(ots_client, table_name, index_name)
+                            for index_name in index_name_list]
+    index_field_set_list = list(zip(index_name_list, index_field_sets))
+
+    # 构造字段到多元索引名称集合的倒排索引
+    column_map: Dict[str, Set[str]] = {}
+    for index_name, index_field_set in index_field_set_list:
+        for field_name in index_field_set:
+            column_map.setdefault(field_name, set()).add(index_name)
+    field_sets = (index_name_list, index_field_set_list,
+                  {field_name: frozenset(index_names) for field_name, index_names in column_map.items()})
+    _set_cache(_SEARCH_INDEX_FIELD_SETS_CACHE, ots_client, cache_key, field_sets)
+    return field_sets
+
+
 def get_primary_key_field_list(ots_client: tablestore.OTSClient,
                                table_name: str) -> List[str]:
     """获取 Tablestore 主键索引包含的字段列表
 
     主键所有的字段是有序的，所以返回有序的列表
     """
+    return _get_primary_key_fields(ots_client, table_name)[0]
+
+
+def get_primary_key_field_set(ots_client: tablestore.OTSClient,
+                              table_name: str) -> FrozenSet[str]:
+    """获取 Tablestore 主键索引包含的字段集合（与字段列表一起缓存，不需要每次重新构造集合）"""
+    return _get_primary_key_fields(ots_client, table_name)[1]
+
+
+def _get_primary_key_fields(ots_client: tablestore.OTSClient,
+                            table_name: str) -> Tuple[List[str], FrozenSet[str]]:
+    """获取 Tablestore 主键索引包含的字段列表和字段集合"""
+    cache_key = (table_name,)
+    cached = _get_cache(_PRIMARY_KEY_FIELD_CACHE, ots_client, cache_key)
+    if cached is not None:
+        return cached
+
     try:
         # 获取表描述信息
         describe_response = ots_client.describe_table(table_name)
 
         # 获取主键索引字段
-        return [field_name for field_name, _ in describe_response.table_meta.schema_of_primary_key]
+        primary_key_list = [field_name for field_name, _ in describe_response.table_meta.schema_of_primary_key]
     except Exception:
         raise ProgrammingError("获取表描述信息失败")
+    primary_key_fields = (primary_key_list, frozenset(primary_key_list))
+    _set_cache(_PRIMARY_KEY_FIELD_CACHE, ots_client, cache_key, primary_key_fields)
+    return primary_key_fields
+
+
+def invalidate_schema_cache(table_name: Optional[str] = None) -> None:
+    """清除表结构和多元索引结构的缓存（在表结构或多元索引变化后调用）
+
+    Parameters
+    ----------
+    table_name : Optional[str], default = None
+        需要清除缓存的表名，为 None 时清除所有表的缓存
+    """
+    with _SCHEMA_CACHE_LOCK:
+        for cache in (_SEARCH_INDEX_NAME_LIST_CACHE, _SEARCH_INDEX_FIELD_SET_CACHE, _SEARCH_INDEX_FIELD_SETS_CACHE,
+                      _PRIMARY_KEY_FIELD_CACHE):
+            if table_name is None:
+                cache.clear()
+                continue
+            for client_cache in list(cache.values()):
+                for cache_key in list(client_cache):
+                    if cache_key[0] == table_name:
+                        del client_cache[cache_key]
+
+
+def _get_cache(cache: weakref.WeakKeyDictionary, ots_client: tablestore.OTSClient, cache_key: tuple) -> Any:
+    """获取有效期内的缓存结果，如果没有缓存或缓存已过期则返回 None"""
+    with _SCHEMA_CACHE_LOCK:
+        client_cache = cache.get(ots_client)
+        cached = client_cache.get(cache_key) if client_cache is not None else None
+    if cached is not None and time.monotonic() - cached[0] < _SCHEMA_CACHE_TTL:
+        return cached[1]
+    return None
+
+
+def _set_cache(cache: weakref.WeakKeyDictionary, ots_client: tablestore.OTSClient, cache_key: tuple,
+               result: Any) -> None:
+    """将结果写入缓存，记录缓存时间"""
+    with _SCHEMA_CACHE_LOCK:
+        cache.setdefault(ots_client, {})[cache_key] = (time.monotonic(), result)
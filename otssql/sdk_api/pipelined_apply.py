@@ -0,0 +1,107 @@
+"""
+流水线执行批量写请求：在后台线程中执行写请求的同时，继续获取后续批次的数据（例如继续扫描需要更新或删除的主键）
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import itertools
+from typing import AsyncGenerator, AsyncIterable, Callable, Deque, Generator, Iterable, List, TypeVar
+
+__all__ = ["pipelined_apply", "iter_chunks", "pipelined_apply_async", "iter_chunks_async"]
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def pipelined_apply(request_fn: Callable[[T], R],
+                    batches: Iterable[T],
+                    max_pending_requests: int = 2
+                    ) -> Generator[R, None, None]:
+    """对 batches 中的每一批数据执行 request_fn，并按批次的顺序 yield 每次请求的结果
+
+    请求在后台线程中执行，主线程继续从 batches 中获取下一批数据；当正在执行的请求达到 max_pending_requests 个时，等待最早的请求完成
+
+    Parameters
+    ----------
+    request_fn : Callable[[T], R]
+        执行一次请求的函数
+    batches : Iterable[T]
+        每次请求的数据
+    max_pending_requests : int, default = 2
+        最多同时执行的请求数，小于等于 0 时在当前线程中依次执行请求
+
+    Yields
+    ------
+    R
+        每次请求的结果
+    """
+    if max_pending_requests <= 0:
+        yield from map(request_fn, batches)
+        return
+
+    pending: Deque[concurrent.futures.Future] = collections.deque()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_pending_requests) as executor:
+        for batch in batches:
+            if len(pending) >= max_pending_requests:
+                yield pending.popleft().result()
+            pending.append(executor.submit(request_fn, batch))
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_chunks(iterable: Iterable[T], chunk_size: int) -> Generator[List[T], None, None]:
+    """将 iterable 按顺序拆分为每组最多 chunk_size 个元素的列表"""
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, chunk_size)):
+        yield chunk
+
+
+async def pipelined_apply_async(request_fn: Callable[[T], R],
+                                batches: AsyncIterable[T],
+                                max_pending_requests: int = 2
+                                ) -> AsyncGenerator[R, None]:
+    """pipelined_apply 的异步版本：通过 asyncio.to_thread 在线程中执行 request_fn，并按批次的顺序 yield 每次请求的结果
+
+    Parameters
+    ----------
+    request_fn : Callable[[T], R]
+        执行一次请求的函数
+    batches : AsyncIterable[T]
+        每次请求的数据
+    max_pending_requests : int, default = 2
+        最多同时执行的请求数，小于等于 0 时依次执行请求
+
+    Yields
+    ------
+    R
+        每次请求的结果
+    """
+    if max_pending_requests <= 0:
+        async for batch in batches:
+            yield await asyncio.to_thread(request_fn, batch)
+        return
+
+    pending: Deque[asyncio.Future] = collections.deque()
+    try:
+        async for batch in batches:
+            if len(pending) >= max_pending_requests:
+                yield await pending.popleft()
+            pending.append(asyncio.ensure_future(asyncio.to_thread(request_fn, batch)))
+        while pending:
+            yield await pending.popleft()
+    finally:
+        if pending:
+            await asyncio.wait(pending)  # 已经提交的请求无法取消，等待其执行完成
+
+
+async def iter_chunks_async(iterable: AsyncIterable[T], chunk_size: int) -> AsyncGenerator[List[T], None]:
+    """iter_chunks 的异步版本：将 iterable 按顺序拆分为每组最多 chunk_size 个元素的列表"""
+    chunk = []
+    async for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
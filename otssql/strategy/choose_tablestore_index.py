@@ -2,19 +2,38 @@
 自动选择 tablestore 的多元索引
 """
 
-import collections
-from typing import List, Tuple, Any
+import dataclasses
+import itertools
+import threading
+import weakref
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
 import tablestore
 
 from metasequoia_sql import node
+from otssql.convert import (REVERSED_OPERATOR, convert_where_clause_to_range_fetching,
+                            primary_key_condition_unsupported, split_column_and_literal)
 from otssql.exceptions import NotSupportedError, ProgrammingError
-from otssql.metasequoia_enhance import get_aggregation_columns_in_node, get_columns_in_node, get_select_alias_set
+from otssql.metasequoia_enhance import get_node_shape, get_select_alias_set, unquote_source
 from otssql.objects import IndexType, UseIndex
-from otssql.sdk_api.get_index_field_set import get_search_index_field_set, get_primary_key_field_list
+from otssql.sdk_api.get_index_field_set import (get_search_index_name_list, get_search_index_field_set,
+                                                get_search_index_field_sets, get_search_index_column_map,
+                                                get_primary_key_field_list, get_primary_key_field_set)
 
 __all__ = ["choose_tablestore_index"]
 
+_ACCURATE_OPS = frozenset({"=", "IN"})  # 主键索引精确查询（单行或多行）中允许的条件类型
+_RANGE_OPS = frozenset({"=", "RANGE"})  # 主键索引范围查询中允许的条件类型
+
+_EMPTY_FIELD_SET: FrozenSet[str] = frozenset()  # UPDATE 和 DELETE 语句共用的空字段清单
+
+_INDEX_CHOICE_CACHE_MAXSIZE = 512  # 每个 OTS 客户端的多元索引选择结果缓存的最大条数，超过时淘汰最久未使用的结果
+
+# 多元索引选择结果的缓存：按 OTS 客户端弱引用分组（客户端被回收后自动清除）；每个客户端的缓存的键为 (table_name, 语句结构)，
+# 值为 (选择时的多元索引列表, 多元索引名称, 所需字段集合)，按最近使用的顺序排列（dict 保留插入顺序，命中时移动到末尾）
+_INDEX_CHOICE_CACHE = weakref.WeakKeyDictionary()
+_INDEX_CHOICE_CACHE_LOCK = threading.Lock()  # 读写多元索引选择结果缓存时持有的锁；请求 Tablestore 时不持有锁
+
 
 def choose_tablestore_index(ots_client: tablestore.OTSClient,
                             table_name: str,
@@ -49,38 +68,69 @@ def choose_tablestore_index(ots_client: tablestore.OTSClient,
     if not isinstance(statement, (node.ASTSelectStatement, node.ASTUpdateStatement, node.ASTDeleteStatement)):
         raise NotSupportedError(f"不支持的语句类型: {statement.__class__.__name__}")
 
+    # ---------- 检查相同结构的语句是否已经选择过多元索引 ----------
+    # 同一模板、仅字面值不同的语句所需的字段相同，可以直接复用多元索引的选择结果
+    choice_key = (table_name, _statement_shape_key(statement))
+    index_name = _get_cached_index_choice(ots_client, table_name, choice_key)
+    if index_name is not None:
+        return UseIndex(index_type=IndexType.SEARCH_INDEX, index_name=index_name)
+
     # ---------- 计算在 SQL 语句各部分所需的字段清单 ----------
+    is_select = isinstance(statement, node.ASTSingleSelectStatement)
 
-    where_field_set = set()  # 在 WHERE 子句中需要索引的字段清单
-    order_field_set = set()  # 在 ORDER BY 子句中需要索引的字段清单
-    other_field_set = set()  # 在聚合、GROUP BY 中需要索引的字段清单
-
-    # 对于 SELECT 语句，需要额外将聚集函数中使用的字段添加到需要索引的字段集合中
-    if isinstance(statement, node.ASTSingleSelectStatement):
-        for quote_column in get_aggregation_columns_in_node(statement.select_clause):
-            if quote_column.column_name == "*":
-                continue  # 在聚集函数中，仅 COUNT(*) 包含通配符，此时忽略即可
-            other_field_set.add(quote_column.column_name)
-        for quote_column in get_columns_in_node(statement.group_by_clause):
-            other_field_set.add(quote_column.column_name)
-    for quote_column in get_columns_in_node(statement.where_clause):
-        where_field_set.add(quote_column.column_name)
-
-    # 将 ORDER BY 的字段添加到需要索引的清单中
-    if isinstance(statement, node.ASTSingleSelectStatement):
-        alias_set = get_select_alias_set(statement.select_clause)
-    else:
-        alias_set = set()
-    for quote_column in get_columns_in_node(statement.order_by_clause):
-        if quote_column.column_name not in alias_set:  # 如果是别名则不需要索引
-            order_field_set.add(quote_column.column_name)
+    (where_field_set, order_field_set, other_field_set, has_aggregation,
+     where_conjuncts) = _collect_field_sets(statement, is_select)
+
+    # 没有聚合、GROUP BY 和 ORDER BY 字段，且 LIMIT 子句没有 OFFSET 时，才可以直接使用主键范围查询（主键索引不支持 OFFSET）
+    can_use_primary_key_range = (not order_field_set and not other_field_set and not has_aggregation
+                                 and (statement.limit_clause is None or not statement.limit_clause.offset))
+
+    # ---------- 检查 WHERE 子句能否直接转化为主键范围查询 ----------
+    # 如果 WHERE 子句仅包含主键字段上的范围条件，则直接使用主键范围查询，不需要再请求多元索引
+    # WHERE 子句包含非主键字段时一定无法转化，不再遍历 WHERE 子句尝试转化
+    if (can_use_primary_key_range and where_field_set
+            and where_field_set <= get_primary_key_field_set(ots_client, table_name)):
+        primary_key_range = _extract_primary_key_range(ots_client, table_name, statement.where_clause)
+        if primary_key_range is not None:
+            return UseIndex(
+                index_type=IndexType.PRIMARY_KEY_RANGE,
+                start_key=primary_key_range[0],
+                end_key=primary_key_range[1],
+                direction="FORWARD"
+            )
+
+    # ---------- 检查是否需要使用索引 ----------
+    # 如果没有 WHERE 子句，也没有需要索引的字段，则直接使用主键范围查询扫描全表，不需要请求多元索引
+    if can_use_primary_key_range and statement.where_clause is None:
+        primary_key_list = get_primary_key_field_list(ots_client, table_name)
+        return UseIndex(
+            index_type=IndexType.PRIMARY_KEY_RANGE,
+            start_key=[(field_name, tablestore.INF_MIN) for field_name in primary_key_list],
+            end_key=[(field_name, tablestore.INF_MAX) for field_name in primary_key_list],
+            direction="FORWARD"
+        )
 
     # ---------- 检查是否存在满足条件的多元索引 ----------
-    need_field_set = other_field_set | where_field_set | order_field_set
-    for _, index_name in ots_client.list_search_index(table_name):
-        index_field_set = get_search_index_field_set(ots_client, table_name, index_name)
-        if index_field_set > need_field_set:
-            return UseIndex(index_type=IndexType.SEARCH_INDEX, index_name=index_name)
+    if is_select:
+        need_field_set = frozenset().union(where_field_set, order_field_set, other_field_set)
+    else:
+        need_field_set = frozenset().union(where_field_set, order_field_set)  # UPDATE 和 DELETE 语句没有聚合、GROUP BY 字段
+    index_name_list = get_search_index_name_list(ots_client, table_name)
+    index_field_sets = get_search_index_field_sets(ots_client, table_name)  # 没有缓存时同时请求各个多元索引的字段清单
+    covering_index_names = _get_covering_index_names(get_search_index_column_map(ots_client, table_name),
+                                                     need_field_set)
+
+    # 在满足条件的多元索引中，选择包含字段最少的多元索引（扫描的开销最小）；字段数相同时按多元索引列表的顺序选择
+    index_name = None
+    min_field_count = None
+    for candidate_name, index_field_set in index_field_sets:
+        if covering_index_names is None or candidate_name in covering_index_names:
+            if min_field_count is None or len(index_field_set) < min_field_count:
+                index_name = candidate_name
+                min_field_count = len(index_field_set)
+    if index_name is not None:
+        _set_cached_index_choice(ots_client, choice_key, (index_name_list, index_name, need_field_set))
+        return UseIndex(index_type=IndexType.SEARCH_INDEX, index_name=index_name)
 
     # ---------- 检查主键索引能否满足查询条件 ----------
     # 如果存在主键索引不支持的查询方式，则抛出异常
@@ -89,7 +139,7 @@ def choose_tablestore_index(ots_client: tablestore.OTSClient,
 
     # 获取主键所有的字段列表
     primary_key_list = get_primary_key_field_list(ots_client, table_name)
-    primary_key_set = set(primary_key_list)
+    primary_key_set = get_primary_key_field_set(ots_client, table_name)
 
     # 检查是否包含主键索引之外的 WHERE 条件 TODO 增加使用过滤条件的主键索引查询方法
     if len(where_field_set - primary_key_set) > 0:
@@ -101,26 +151,30 @@ def choose_tablestore_index(ots_client: tablestore.OTSClient,
         raise NotSupportedError("主键索引暂时不支持 ORDER BY 子句")  # TODO 待支持
 
     # ---------- 整理主键索引的查询条件 ----------
-    conditions = get_condition_in_where_clause(statement.where_clause.condition)
-    condition_of_field = collections.defaultdict(list)
+    conditions = _get_condition_of_conjuncts(where_conjuncts)  # 复用计算字段清单时拆分的逻辑与子条件，不再重复遍历 WHERE 子句
+    condition_of_field: Dict[str, List[Tuple[str, Any]]] = {}
     for field_name, op, value in conditions:
-        condition_of_field[field_name].append((op, value))
+        condition_of_field.setdefault(field_name, []).append((op, value))
 
     must_range = False  # 是否一定需要范围查询
     must_accurate = False  # 是否一定需要精确查询（单条或范围）
     primary_key_conditions = []
     for field_name in primary_key_list:
-        if field_name not in condition_of_field:
+        condition = condition_of_field.get(field_name)
+        if condition is None:
             # 该字段没有查询条件
             primary_key_conditions.append((field_name, "RANGE", tablestore.INF_MIN, tablestore.INF_MAX))
             must_range = True
         else:
-            condition = condition_of_field[field_name]
             if len(condition) == 2:
-                condition.sort()
-                if condition[0][0] != "<" or condition[1][0] != ">=":
+                (op1, value1), (op2, value2) = condition
+                if op1 == ">=" and op2 == "<":
+                    min_value, max_value = value1, value2
+                elif op1 == "<" and op2 == ">=":
+                    min_value, max_value = value2, value1
+                else:
                     raise NotSupportedError("主键索引在同一个字段上包含 2 个条件时，必须一个是 >=，另一个是 <")
-                primary_key_conditions.append((field_name, "RANGE", condition[1][1], condition[0][1]))
+                primary_key_conditions.append((field_name, "RANGE", min_value, max_value))
                 must_range = True
             elif len(condition) == 1:
                 op, value = condition[0]
@@ -145,20 +199,15 @@ def choose_tablestore_index(ots_client: tablestore.OTSClient,
 
     # ---------- 构造逐渐索引查询规则 ----------
     if not must_range:
-        # 逐个字段生成主键索引的值列表
-        last_primary_key = [tuple()]
+        # 逐个字段生成主键索引的可选值列表，然后通过笛卡尔积生成所有主键
+        field_options = []
         for field_name, op, value, _ in primary_key_conditions:
-            assert op in {"=", "IN"}, "主键索引非范围查询逻辑中包含非 = 和 IN 的条件"
-            new_primary_key = []
+            assert op in _ACCURATE_OPS, "主键索引非范围查询逻辑中包含非 = 和 IN 的条件"
             if op == "=":
-                for key in last_primary_key:
-                    new_primary_key.append(key + ((field_name, value),))
+                field_options.append([(field_name, value)])
             else:  # op == "IN"
-                for key in last_primary_key:
-                    for v in value:
-                        new_primary_key.append(key + ((field_name, v),))
-            last_primary_key = new_primary_key
-        rows_to_get = [list(primary_key) for primary_key in last_primary_key]
+                field_options.append([(field_name, v) for v in value])
+        rows_to_get = [list(primary_key) for primary_key in itertools.product(*field_options)]
         if len(rows_to_get) == 1:
             # 使用主键索引 - 单行查询
             return UseIndex(
@@ -177,7 +226,7 @@ def choose_tablestore_index(ots_client: tablestore.OTSClient,
         start_key = []
         end_key = []
         for field_name, op, min_value, max_value in primary_key_conditions:
-            assert op in {"=", "RANGE"}, "主键索引范围查询中包含非 = 和 RANGE 的条件"
+            assert op in _RANGE_OPS, "主键索引范围查询中包含非 = 和 RANGE 的条件"
             start_key.append((field_name, min_value))
             end_key.append((field_name, max_value))
         return UseIndex(
@@ -188,101 +237,202 @@ def choose_tablestore_index(ots_client: tablestore.OTSClient,
         )
 
 
-def get_condition_in_where_clause(ast_node: node.ASTBase) -> List[Tuple[str, str, Any]]:
-    """获取 WHERE 条件中包含的条件信息
+def _statement_shape_key(statement: node.ASTBase) -> tuple:
+    """计算语句的结构键：将所有字面值替换为占位符 "?"，保留字段名、运算符和语句结构"""
+    return get_node_shape(statement, literal_placeholder="?")
+
+
+def _get_covering_index_names(index_column_map: Dict[str, FrozenSet[str]],
+                              need_field_set: FrozenSet[str]) -> Optional[FrozenSet[str]]:
+    """通过字段到多元索引的倒排索引，获取包含所有所需字段的多元索引名称集合；没有所需字段时返回 None（所有多元索引均满足）"""
+    if not need_field_set:
+        return None
+    index_name_sets = []
+    for field_name in need_field_set:
+        index_names = index_column_map.get(field_name)
+        if index_names is None:
+            return frozenset()  # 没有多元索引包含该字段
+        index_name_sets.append(index_names)
+    index_name_sets.sort(key=len)  # 从包含该字段的多元索引最少的字段开始求交集，使中间结果尽可能小
+    return index_name_sets[0].intersection(*index_name_sets[1:])
+
+
+def _get_cached_index_choice(ots_client: tablestore.OTSClient, table_name: str,
+                             choice_key: Tuple[str, tuple]) -> Optional[str]:
+    """获取缓存的多元索引选择结果；如果多元索引列表已刷新或多元索引已不包含所需字段，则不使用缓存"""
+    with _INDEX_CHOICE_CACHE_LOCK:
+        client_cache = _INDEX_CHOICE_CACHE.get(ots_client)
+        cached = client_cache.get(choice_key) if client_cache is not None else None
+    if cached is None:
+        return None
+
+    # 检查缓存是否仍然有效时可能需要请求 Tablestore，不持有锁
+    index_name_list, index_name, need_field_set = cached
+    is_valid = (get_search_index_name_list(ots_client, table_name) is index_name_list
+                and get_search_index_field_set(ots_client, table_name, index_name).issuperset(need_field_set))
+
+    with _INDEX_CHOICE_CACHE_LOCK:
+        if client_cache.get(choice_key) is cached:  # 检查期间其他线程没有更新或淘汰该结果
+            client_cache.pop(choice_key)
+            if is_valid:
+                client_cache[choice_key] = cached  # 移动到末尾，标记为最近使用
+    return index_name if is_valid else None
+
+
+def _set_cached_index_choice(ots_client: tablestore.OTSClient, choice_key: Tuple[str, tuple],
+                             choice: Tuple[List[str], str, FrozenSet[str]]) -> None:
+    """缓存多元索引选择结果，超过最大条数时淘汰最久未使用的结果"""
+    with _INDEX_CHOICE_CACHE_LOCK:
+        client_cache = _INDEX_CHOICE_CACHE.setdefault(ots_client, {})
+        client_cache.pop(choice_key, None)
+        if len(client_cache) >= _INDEX_CHOICE_CACHE_MAXSIZE:
+            client_cache.pop(next(iter(client_cache)))  # 淘汰最久未使用的结果
+        client_cache[choice_key] = choice
+
+
+def _collect_field_sets(statement: node.ASTBase, is_select: bool
+                        ) -> Tuple[Set[str], Set[str], Set[str], bool, List[node.ASTBase]]:
+    """遍历一次抽象语法树，同时计算在 SQL 语句各部分所需的字段清单，并拆分 WHERE 子句中逻辑与连接的各个子条件
 
     Parameters
     ----------
-    ast_node : ASTBase
-        抽象语法树节点
+    statement : node.ASTBase
+        SELECT、UPDATE 或 DELETE 语句节点
+    is_select : bool
+        是否为 SELECT 语句
+
+    Returns
+    -------
+    where_field_set : Set[str]
+        在 WHERE 子句中需要索引的字段清单
+    order_field_set : Set[str]
+        在 ORDER BY 子句中需要索引的字段清单（不包含 SELECT 子句中的别名）
+    other_field_set : Set[str]
+        在聚合、GROUP BY 中需要索引的字段清单
+    has_aggregation : bool
+        SELECT 子句中是否包含聚集函数
+    where_conjuncts : List[node.ASTBase]
+        WHERE 子句中逻辑与连接的各个子条件（按从左到右的顺序）
+    """
+    where_field_set = set()
+    order_field_set = set()
+    other_field_set = set() if is_select else _EMPTY_FIELD_SET  # UPDATE 和 DELETE 语句不需要计算
+    has_aggregation = False
+    where_conjuncts = []
+
+    # 栈中的元素为 (抽象语法树中的元素, 字段所属的字段清单, 是否记录字段, 是否为 WHERE 子句中逻辑与连接的子条件)；
+    # SELECT 子句仅记录聚集函数中的字段
+    where_condition = statement.where_clause.condition if statement.where_clause is not None else None
+    stack = [(where_condition, where_field_set, True, True), (statement.order_by_clause, order_field_set, True, False)]
+    if is_select:
+        stack.append((statement.group_by_clause, other_field_set, True, False))
+        stack.append((statement.select_clause, other_field_set, False, False))
+    while stack:
+        obj, field_set, need_collect, is_conjunct = stack.pop()
+        if is_conjunct and obj is not None:
+            if type(obj) is node.ASTLogicalAndExpression:
+                stack.append((obj.after_value, field_set, need_collect, True))
+                stack.append((obj.before_value, field_set, need_collect, True))
+                continue
+            where_conjuncts.append(obj)
+        if isinstance(obj, node.ASTBase):
+            if isinstance(obj, node.ASTColumnNameExpression):
+                if need_collect and obj.column_name != "*":  # 在聚集函数中，仅 COUNT(*) 包含通配符，此时忽略即可
+                    field_set.add(obj.column_name)
+                continue
+            if isinstance(obj, node.ASTAggregationFunction):
+                has_aggregation = True
+                need_collect = True
+            for field in dataclasses.fields(obj):
+                stack.append((getattr(obj, field.name), field_set, need_collect, False))
+        elif isinstance(obj, (list, set, tuple)):
+            for item in obj:
+                stack.append((item, field_set, need_collect, False))
+
+    # 如果 ORDER BY 子句中的字段是 SELECT 子句中的别名，则不需要索引
+    if is_select and order_field_set:
+        order_field_set -= get_select_alias_set(statement.select_clause)
+
+    return where_field_set, order_field_set, other_field_set, has_aggregation, where_conjuncts
+
+
+def _extract_primary_key_range(ots_client: tablestore.OTSClient,
+                               table_name: str,
+                               where_clause: node.ASTWhereClause) -> Optional[Tuple[List[tuple], List[tuple]]]:
+    """尝试将 WHERE 子句转化为主键范围查询的起止主键，如果 WHERE 子句无法转化为主键范围查询则返回 None
+
+    Parameters
+    ----------
+    ots_client : tablestore.OTSClient
+        OTS 客户端
+    table_name : str
+        表名
+    where_clause : node.ASTWhereClause
+        WHERE 子句节点
+
+    Returns
+    -------
+    Optional[Tuple[List[tuple], List[tuple]]]
+        起始主键和结束主键
     """
-    if isinstance(ast_node, node.ASTOperatorConditionExpression):  # 比较运算符的表达式
-        if ast_node.operator.source() == "=":
-            if (isinstance(ast_node.before_value, node.ASTColumnNameExpression)
-                    and isinstance(ast_node.after_value, node.ASTLiteralExpression)):
-                # 字段名 = 字面值
-                return [
-                    (ast_node.before_value.column_name, "=", ast_node.after_value.as_string().strip("'")),
-                ]
-            elif (isinstance(ast_node.before_value, node.ASTLiteralExpression)
-                  and isinstance(ast_node.after_value, node.ASTColumnNameExpression)):
-                # 字面值 = 字段名
-                return [
-                    (ast_node.after_value.column_name, "=", ast_node.before_value.as_string().strip("'")),
-                ]
-            raise NotSupportedError("暂不支持的表达式形式（比较运算符前后不是一个字段名、一个字面值）")
-        if ast_node.operator.source() == "<":
-            if (isinstance(ast_node.before_value, node.ASTColumnNameExpression)
-                    and isinstance(ast_node.after_value, node.ASTLiteralExpression)):
-                # 字段名 < 字面值
-                return [
-                    (ast_node.before_value.column_name, "<", ast_node.after_value.as_string().strip("'")),
-                ]
-            elif (isinstance(ast_node.before_value, node.ASTLiteralExpression)
-                  and isinstance(ast_node.after_value, node.ASTColumnNameExpression)):
-                # 字面值 < 字面名
-                raise NotSupportedError("主键索引不支持 > 的查询方式，仅支持 >= 和 <")
-            raise NotSupportedError("暂不支持的表达式形式（比较运算符前后不是一个字段名、一个字面值）")
-        if ast_node.operator.source() == "<=":
-            if (isinstance(ast_node.before_value, node.ASTColumnNameExpression)
-                    and isinstance(ast_node.after_value, node.ASTLiteralExpression)):
-                # 字段名 <= 字面值
-                raise NotSupportedError("主键索引不支持 <= 的查询方式，仅支持 < 和 >=")
-            elif (isinstance(ast_node.before_value, node.ASTLiteralExpression)
-                  and isinstance(ast_node.after_value, node.ASTColumnNameExpression)):
-                # 字面值 <= 字段名
-                return [
-                    (ast_node.after_value.column_name, ">=", ast_node.before_value.as_string().strip("'")),
-                ]
-            raise NotSupportedError("暂不支持的表达式形式（比较运算符前后不是一个字段名、一个字面值）")
-        if ast_node.operator.source() == ">":
-            if (isinstance(ast_node.before_value, node.ASTColumnNameExpression)
-                    and isinstance(ast_node.after_value, node.ASTLiteralExpression)):
-                # 字段名 > 字面值
-                raise NotSupportedError("主键索引不支持 > 的查询方式，仅支持 >= 和 <")
-            elif (isinstance(ast_node.before_value, node.ASTLiteralExpression)
-                  and isinstance(ast_node.after_value, node.ASTColumnNameExpression)):
-                # 字面值 > 字段名
-                return [
-                    (ast_node.after_value.column_name, "<", ast_node.before_value.as_string().strip("'")),
-                ]
-            raise NotSupportedError("暂不支持的表达式形式（比较运算符前后不是一个字段名、一个字面值）")
-        if ast_node.operator.source() == ">=":
-            if (isinstance(ast_node.before_value, node.ASTColumnNameExpression)
-                    and isinstance(ast_node.after_value, node.ASTLiteralExpression)):
-                # 字段名 >= 字面值
-                return [
-                    (ast_node.before_value.column_name, ">=", ast_node.after_value.as_string().strip("'")),
-                ]
-            elif (isinstance(ast_node.before_value, node.ASTLiteralExpression)
-                  and isinstance(ast_node.after_value, node.ASTColumnNameExpression)):
-                raise NotSupportedError("主键索引不支持 <= 的查询方式，仅支持 < 和 >=")
-            raise NotSupportedError("暂不支持的表达式形式（比较运算符前后不是一个字段名、一个字面值）")
-        if ast_node.operator.source() == "!=":
-            raise NotSupportedError("主键索引不支持 != 运算符")
-    if isinstance(ast_node, node.ASTBetweenExpression):  # BETWEEN 表达式
-        raise NotSupportedError("主键索引不支持闭区间的 BETWEEN 表达式")
-    if isinstance(ast_node, node.ASTIsExpression):  # IS NULL 或 IS NOT NULL
-        raise NotSupportedError("主键索引不支持 IS 运算符")
-    if isinstance(ast_node, node.ASTInExpression):  # IN 语句
-        if not isinstance(ast_node.before_value, node.ASTColumnNameExpression):
-            raise NotSupportedError("暂不支持的表达式形式（IN 之前不是字段名）")
-        if not isinstance(ast_node.after_value, node.ASTSubValueExpression):
-            raise NotSupportedError("暂不支持的表达式形式（IN 之后不是值列表）")
-        return [
-            (ast_node.before_value.column_name, "IN",
-             [value.source().strip("'") for value in ast_node.after_value.values]),
-        ]
-    if isinstance(ast_node, node.ASTLikeExpression):  # LIKE 语句
-        raise NotSupportedError("主键索引不支持 LIKE 运算符")
-    if isinstance(ast_node, node.ASTLogicalAndExpression):  # 逻辑与表达式
-        condition1: List[tuple] = get_condition_in_where_clause(ast_node.before_value)
-        condition2: List[tuple] = get_condition_in_where_clause(ast_node.after_value)
-        return condition1 + condition2
-    if isinstance(ast_node, node.ASTLogicalOrExpression):  # 逻辑或表达式
-        raise NotSupportedError("主键索引不支持 OR 运算符")
-    if isinstance(ast_node, node.ASTLogicalNotExpression):  # 逻辑否表达式
-        raise NotSupportedError("主键索引不支持 NOT 运算符")
-    if isinstance(ast_node, node.ASTLogicalXorExpression):  # 逻辑异或表达式
-        raise NotSupportedError("主键索引不支持 XOR 运算符")
-    raise KeyError(f"暂无法支持的 WHERE 条件（不是比较运算符的形式）: {ast_node}")
+    try:
+        return convert_where_clause_to_range_fetching(ots_client, table_name, where_clause)
+    except NotSupportedError:
+        return None
+
+
+def _get_condition_of_conjuncts(conjuncts: List[node.ASTBase]) -> List[Tuple[str, str, Any]]:
+    """获取逻辑与连接的各个子条件中包含的条件信息"""
+    conditions = []
+    for conjunct in conjuncts:
+        handler = _CONDITION_HANDLERS.get(type(conjunct))
+        if handler is None:
+            raise KeyError(f"暂无法支持的 WHERE 条件（不是比较运算符的形式）: {conjunct}")
+        conditions.extend(handler(conjunct))
+    return conditions
+
+
+def _condition_of_operator(ast_node: node.ASTOperatorConditionExpression) -> List[Tuple[str, str, Any]]:
+    """比较运算符的表达式：统一转化为字段名在左侧的形式，范围条件仅支持 >= 和 <"""
+    op = ast_node.operator.source()
+    if op == "!=":
+        raise NotSupportedError("主键索引不支持 != 运算符")
+    if op not in REVERSED_OPERATOR:
+        raise KeyError(f"暂无法支持的 WHERE 条件（不是比较运算符的形式）: {ast_node}")
+    field_name, value, column_on_left = split_column_and_literal(ast_node)
+    if not column_on_left:
+        op = REVERSED_OPERATOR[op]  # 字面值 ? 字段名 -> 字段名 ? 字面值
+    if op in _UNSUPPORTED_RANGE_MESSAGES:
+        raise NotSupportedError(_UNSUPPORTED_RANGE_MESSAGES[op])
+    return [(field_name, op, value)]
+
+
+def _condition_of_in(ast_node: node.ASTInExpression) -> List[Tuple[str, str, Any]]:
+    """IN 语句"""
+    if not isinstance(ast_node.before_value, node.ASTColumnNameExpression):
+        raise NotSupportedError("暂不支持的表达式形式（IN 之前不是字段名）")
+    if not isinstance(ast_node.after_value, node.ASTSubValueExpression):
+        raise NotSupportedError("暂不支持的表达式形式（IN 之后不是值列表）")
+    return [
+        (ast_node.before_value.column_name, "IN",
+         list(map(unquote_source, ast_node.after_value.values))),
+    ]
+
+
+# 主键索引范围查询不支持的比较运算符（字段名在左侧的形式）及异常信息
+_UNSUPPORTED_RANGE_MESSAGES = {
+    ">": "主键索引不支持 > 的查询方式，仅支持 >= 和 <",
+    "<=": "主键索引不支持 <= 的查询方式，仅支持 < 和 >=",
+}
+
+# 抽象语法树节点类型到条件信息转化函数的映射
+_CONDITION_HANDLERS = {
+    node.ASTOperatorConditionExpression: _condition_of_operator,
+    node.ASTBetweenExpression: primary_key_condition_unsupported("主键索引不支持闭区间的 BETWEEN 表达式"),
+    node.ASTIsExpression: primary_key_condition_unsupported("主键索引不支持 IS 运算符"),
+    node.ASTInExpression: _condition_of_in,
+    node.ASTLikeExpression: primary_key_condition_unsupported("主键索引不支持 LIKE 运算符"),
+    node.ASTLogicalOrExpression: primary_key_condition_unsupported("主键索引不支持 OR 运算符"),
+    node.ASTLogicalNotExpression: primary_key_condition_unsupported("主键索引不支持 NOT 运算符"),
+    node.ASTLogicalXorExpression: primary_key_condition_unsupported("主键索引不支持 XOR 运算符"),
+}
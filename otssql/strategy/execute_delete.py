@@ -8,7 +8,7 @@ from metasequoia_sql import node
 from otssql import convert, sdk_api
 from otssql.objects import UseIndex
 
-__all__ = ["execute_delete"]
+__all__ = ["execute_delete", "execute_delete_async"]
 
 
 def execute_delete(ots_client: tablestore.OTSClient,
@@ -17,7 +17,8 @@ def execute_delete(ots_client: tablestore.OTSClient,
                    statement: node.ASTDeleteStatement,
                    max_row_per_request: int,
                    max_delete_row: int,
-                   max_row_total_limit: int):
+                   max_row_total_limit: int,
+                   where_clause_cache: bool = False):
     """执行 DELETE 语句"""
 
     offset, limit = convert.convert_limit_clause(
@@ -29,10 +30,40 @@ def execute_delete(ots_client: tablestore.OTSClient,
         statement=statement,
         offset=offset, limit=limit,
         return_type=tablestore.ColumnReturnType.NONE,
-        max_row_per_request=max_row_per_request)
+        max_row_per_request=max_row_per_request,
+        where_clause_cache=where_clause_cache)
 
     # 查询需要删除的记录的主键
     primary_key_iterator = (query_row[0] for query_row in query_result_iterator)
 
     # 执行更新逻辑
     return sdk_api.do_multi_delete(ots_client, table_name, primary_key_iterator)
+
+
+async def execute_delete_async(ots_client: tablestore.OTSClient,
+                               table_name: str,
+                               use_index: UseIndex,
+                               statement: node.ASTDeleteStatement,
+                               max_row_per_request: int,
+                               max_delete_row: int,
+                               max_row_total_limit: int,
+                               where_clause_cache: bool = False):
+    """异步执行 DELETE 语句（查询和删除请求均通过 asyncio.to_thread 在线程中执行，可以使用 asyncio.gather 同时执行多个语句）"""
+
+    offset, limit = convert.convert_limit_clause(
+        statement.limit_clause, max_delete_row,
+        max_row_total_limit=max_row_total_limit)  # 转换 LIMIT 子句的逻辑
+
+    query_result_iterator = sdk_api.do_query_async(
+        ots_client=ots_client, table_name=table_name, use_index=use_index,
+        statement=statement,
+        offset=offset, limit=limit,
+        return_type=tablestore.ColumnReturnType.NONE,
+        max_row_per_request=max_row_per_request,
+        where_clause_cache=where_clause_cache)
+
+    # 查询需要删除的记录的主键
+    primary_key_iterator = (query_row[0] async for query_row in query_result_iterator)
+
+    # 执行删除逻辑
+    return await sdk_api.do_multi_delete_async(ots_client, table_name, primary_key_iterator)
@@ -17,10 +17,11 @@ __all__ = ["execute_select_aggregation"]
 def execute_select_aggregation(ots_client: tablestore.OTSClient,
                                table_name: str,
                                index_name: str,
-                               statement: node.ASTSingleSelectStatement) -> Tuple[List[tuple], List[tuple]]:
+                               statement: node.ASTSingleSelectStatement,
+                               where_clause_cache: bool = False) -> Tuple[List[tuple], List[tuple]]:
     """执行包含聚合的 SELECT 语句"""
 
-    query = convert.convert_where_clause(statement.where_clause)
+    query = convert.convert_where_clause(statement.where_clause, use_cache=where_clause_cache)
 
     # 生成聚合条件的结果字段
     sub_aggs = []
@@ -18,9 +18,10 @@ def execute_select_group_by(ots_client: tablestore.OTSClient,
                             table_name: str,
                             index_name: str,
                             statement: node.ASTSingleSelectStatement,
-                            max_group_size: int) -> Tuple[List[tuple], List[tuple]]:
+                            max_group_size: int,
+                            where_clause_cache: bool = False) -> Tuple[List[tuple], List[tuple]]:
     """执行包含 GROUP BY 的 SELECT 语句"""
-    query = convert.convert_where_clause(statement.where_clause)
+    query = convert.convert_where_clause(statement.where_clause, use_cache=where_clause_cache)
     select_column_set = get_select_column_set(statement.select_clause)
 
     # ------------------------------ 分析 ORDER BY 字段 ------------------------------
@@ -28,8 +29,9 @@ def execute_select_group_by(ots_client: tablestore.OTSClient,
     order_by_hash = {}
     if statement.order_by_clause is not None:
         for column_name in statement.order_by_clause.columns:
-            order_by_columns.append(column_name.column.source().strip("`"))
-            order_by_hash[column_name.column.source().strip("`")] = column_name
+            order_by_column_name = column_name.column.source().strip("`")
+            order_by_columns.append(order_by_column_name)
+            order_by_hash[order_by_column_name] = column_name
         print("在 GROUP BY 子句后使用 ORDER BY 子句，仅对默认排序规则下的数据生效")
 
     if statement.limit_clause is not None:
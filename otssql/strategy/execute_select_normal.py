@@ -2,14 +2,14 @@
 执行非聚合、非 GROUP BY 的普通 SELECT 语句
 """
 
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import tablestore
 
 from metasequoia_sql import node
 from otssql import convert, sdk_api
 from otssql.constants import FieldType
-from otssql.metasequoia_enhance import get_select_column_set
+from otssql.metasequoia_enhance import SelectColumnSet, get_select_column_set
 from otssql.objects import UseIndex
 from otssql.strategy.detect_type import detect_field_type
 
@@ -22,7 +22,9 @@ def execute_select_normal(ots_client: tablestore.OTSClient,
                           statement: node.ASTSingleSelectStatement,
                           max_row_per_request: int,
                           max_select_row: int,
-                          max_row_total_limit: int) -> Tuple[List[tuple], List[tuple]]:
+                          max_row_total_limit: int,
+                          where_clause_cache: bool = False,
+                          select_column_set: Optional[SelectColumnSet] = None) -> Tuple[List[tuple], List[tuple]]:
     """执行非聚合、非 GROUP BY 的普通 SELECT 语句
 
     Parameters
@@ -41,6 +43,10 @@ def execute_select_normal(ots_client: tablestore.OTSClient,
         【Tablestore SDK】单次 SELECT 语句返回的最大记录数
     max_row_total_limit : int
         【Tablestore SDK 常量】limit 与 offset 之和的最大值
+    where_clause_cache : bool, default = False
+        是否使用 WHERE 子句的编译缓存
+    select_column_set : Optional[SelectColumnSet], default = None
+        已经计算的 SELECT 子句字段清单，为 None 时根据 statement 计算
 
     Returns
     -------
@@ -52,38 +58,34 @@ def execute_select_normal(ots_client: tablestore.OTSClient,
     offset, limit = convert.convert_limit_clause(statement.limit_clause, max_select_row,
                                                  max_row_total_limit=max_row_total_limit)
 
-    query_result = list(sdk_api.do_query(
-        ots_client=ots_client, table_name=table_name, use_index=use_index,
-        statement=statement,
-        offset=offset, limit=limit,
-        return_type=tablestore.ColumnReturnType.ALL,
-        max_row_per_request=max_row_per_request))
+    if select_column_set is None:
+        select_column_set = get_select_column_set(statement.select_clause)
 
-    select_column_set = get_select_column_set(statement.select_clause)
-
-    # 汇总所有记录的结果字段（因为每一条记录返回的字段可能不一致）
+    # 逐行消费查询结果：将每条记录构造为仅包含所需字段的字典，同时汇总所有记录的结果字段（因为每一条记录返回的字段可能不一致）
     columns_set = set()
-    for row in query_result:
-        for field_name, _ in row[0]:  # 主键字段
+    row_dict_list = []
+    for row in sdk_api.do_query(
+            ots_client=ots_client, table_name=table_name, use_index=use_index,
+            statement=statement,
+            offset=offset, limit=limit,
+            return_type=tablestore.ColumnReturnType.ALL,
+            max_row_per_request=max_row_per_request,
+            where_clause_cache=where_clause_cache):
+        row_dict = {}
+        for field_name, column_value in row[0]:  # 主键字段
             if field_name in select_column_set:
-                columns_set.add(field_name)
-        for field_name, _, _ in row[1]:  # 非主键字段
+                row_dict[field_name] = column_value
+        for field_name, column_value, _ in row[1]:  # 非主键字段
             if field_name in select_column_set:
-                columns_set.add(field_name)
+                row_dict[field_name] = column_value
+        columns_set.update(row_dict)
+        row_dict_list.append(row_dict)
     columns_list = list(columns_set)  # TODO 增加逻辑使结果尽可能有序
 
     # 初始化查询信息和查询结果
     description = [[column, FieldType.UNKNOWN, None, None, None, None, None] for column in columns_list]
     result_set = []
-    for row in query_result:
-
-        # 先将查询结果构造为字典用于查询
-        row_dict = {}
-        for field_name, column_value in row[0]:  # 主键字段
-            row_dict[field_name] = column_value
-        for field_name, column_value, _ in row[1]:  # 非主键字段
-            row_dict[field_name] = column_value
-
+    for row_dict in row_dict_list:
         # 构造结果的元组并更新字段类型
         row_tuple = []
         for i, column in enumerate(columns_list):
@@ -0,0 +1,77 @@
+"""
+自动选择 Tablestore 索引的测试
+
+运行方法：python -m unittest discover -s tests
+"""
+
+import gc
+import types
+import unittest
+
+import tablestore
+
+from metasequoia_sql import SQLParser
+from otssql.objects import IndexType
+from otssql.sdk_api import invalidate_schema_cache
+from otssql.strategy import choose_tablestore_index
+from otssql.strategy.choose_tablestore_index import _INDEX_CHOICE_CACHE
+
+
+class StubClient:
+    """只实现选择索引时需要的表结构接口的 OTS 客户端：表 t 的主键为 id，多元索引 idx 包含字段 id、a、b"""
+
+    def list_search_index(self, table_name):
+        return [(table_name, "idx")]
+
+    def describe_search_index(self, table_name, index_name):
+        fields = [types.SimpleNamespace(field_name=field_name, field_type=None) for field_name in ("id", "a", "b")]
+        return types.SimpleNamespace(fields=fields), None
+
+    def describe_table(self, table_name):
+        table_meta = types.SimpleNamespace(schema_of_primary_key=[("id", "INTEGER")])
+        return types.SimpleNamespace(table_meta=table_meta)
+
+
+class TestChooseTablestoreIndex(unittest.TestCase):
+    """根据 SQL 语句选择多元索引或主键索引"""
+
+    def setUp(self):
+        invalidate_schema_cache()
+        self.ots_client = StubClient()
+
+    def choose(self, sql: str):
+        return choose_tablestore_index(self.ots_client, "t", SQLParser.parse_statements(sql)[0])
+
+    def assert_full_scan(self, use_index):
+        self.assertEqual(use_index.index_type, IndexType.PRIMARY_KEY_RANGE)
+        self.assertEqual(use_index.start_key, [("id", tablestore.INF_MIN)])
+        self.assertEqual(use_index.end_key, [("id", tablestore.INF_MAX)])
+
+    def test_select_without_where(self):
+        self.assert_full_scan(self.choose("SELECT a FROM t"))
+
+    def test_delete_without_where(self):
+        self.assert_full_scan(self.choose("DELETE FROM t"))
+
+    def test_constant_where_uses_search_index(self):
+        use_index = self.choose("SELECT a FROM t WHERE 1 = 1")
+        self.assertEqual(use_index.index_type, IndexType.SEARCH_INDEX)
+        self.assertEqual(use_index.index_name, "idx")
+
+    def test_offset_uses_search_index(self):
+        use_index = self.choose("SELECT a FROM t LIMIT 5, 10")
+        self.assertEqual(use_index.index_type, IndexType.SEARCH_INDEX)
+        self.assertEqual(use_index.index_name, "idx")
+
+    def test_index_choice_cache_released_with_client(self):
+        self.choose("SELECT a FROM t WHERE a = 1")
+        self.assertEqual(self.choose("SELECT a FROM t WHERE a = 2").index_name, "idx")  # 相同结构的语句命中缓存
+        self.assertEqual(len(_INDEX_CHOICE_CACHE[self.ots_client]), 1)
+        n_client = len(_INDEX_CHOICE_CACHE)
+        del self.ots_client
+        gc.collect()
+        self.assertEqual(len(_INDEX_CHOICE_CACHE), n_client - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+表结构和多元索引结构缓存的测试
+
+运行方法：python -m unittest discover -s tests
+"""
+
+import gc
+import types
+import unittest
+
+from otssql.sdk_api import get_index_field_set, get_primary_key_field_list, invalidate_schema_cache
+
+
+class StubClient:
+    """只实现 describe_table 接口的 OTS 客户端，记录请求次数"""
+
+    def __init__(self, primary_key_list):
+        self.primary_key_list = primary_key_list
+        self.n_describe_table = 0
+
+    def describe_table(self, table_name):
+        self.n_describe_table += 1
+        schema_of_primary_key = [(field_name, "INTEGER") for field_name in self.primary_key_list]
+        return types.SimpleNamespace(table_meta=types.SimpleNamespace(schema_of_primary_key=schema_of_primary_key))
+
+
+class TestSchemaCache(unittest.TestCase):
+    """表结构缓存按 OTS 客户端区分"""
+
+    def setUp(self):
+        invalidate_schema_cache()
+
+    def test_cache_hit(self):
+        ots_client = StubClient(["id"])
+        self.assertEqual(get_primary_key_field_list(ots_client, "t"), ["id"])
+        self.assertEqual(get_primary_key_field_list(ots_client, "t"), ["id"])
+        self.assertEqual(ots_client.n_describe_table, 1)
+
+    def test_cache_per_client(self):
+        self.assertEqual(get_primary_key_field_list(StubClient(["id"]), "t"), ["id"])
+        self.assertEqual(get_primary_key_field_list(StubClient(["uid"]), "t"), ["uid"])
+
+    def test_cache_released_with_client(self):
+        ots_client = StubClient(["id"])
+        get_primary_key_field_list(ots_client, "t")
+        self.assertEqual(len(get_index_field_set._PRIMARY_KEY_FIELD_CACHE), 1)
+        del ots_client
+        gc.collect()
+        self.assertEqual(len(get_index_field_set._PRIMARY_KEY_FIELD_CACHE), 0)
+
+    def test_invalidate_table(self):
+        ots_client = StubClient(["id"])
+        get_primary_key_field_list(ots_client, "t")
+        get_primary_key_field_list(ots_client, "s")
+        invalidate_schema_cache("t")
+        get_primary_key_field_list(ots_client, "t")
+        get_primary_key_field_list(ots_client, "s")
+        self.assertEqual(ots_client.n_describe_table, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
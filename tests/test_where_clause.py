@@ -0,0 +1,135 @@
+"""
+WHERE 子句转化器的测试
+
+运行方法：python -m unittest discover -s tests
+"""
+
+import unittest
+
+import tablestore
+
+from metasequoia_sql import SQLParser
+from otssql.convert import convert_where_clause, convert_where_clause_to_range
+from otssql.convert.where_clause import _simplify_query
+from otssql.exceptions import NotSupportedError
+
+
+def parse_where_clause(condition: str):
+    """解析 WHERE 子句"""
+    return SQLParser.parse_select_statement(f"SELECT * FROM t WHERE {condition}").where_clause
+
+
+def describe_query(query: tablestore.Query) -> tuple:
+    """将查询条件转化为可以比较的嵌套元组"""
+    if isinstance(query, tablestore.BoolQuery):
+        return ("BoolQuery",
+                tuple(describe_query(sub_query) for sub_query in query.must_queries),
+                tuple(describe_query(sub_query) for sub_query in query.must_not_queries),
+                tuple(describe_query(sub_query) for sub_query in query.filter_queries),
+                tuple(describe_query(sub_query) for sub_query in query.should_queries),
+                query.minimum_should_match)
+    if isinstance(query, tablestore.TermQuery):
+        return "TermQuery", query.field_name, query.column_value
+    if isinstance(query, tablestore.RangeQuery):
+        return ("RangeQuery", query.field_name, query.range_from, query.range_to,
+                query.include_lower, query.include_upper)
+    return (type(query).__name__,)
+
+
+def convert(condition: str, use_cache: bool = False) -> tablestore.Query:
+    """将 WHERE 条件转化为查询条件"""
+    return convert_where_clause(parse_where_clause(condition), use_cache=use_cache)
+
+
+class TestSimplifyQuery(unittest.TestCase):
+    """化简查询条件（双重否定、德摩根定律、合并否定条件）"""
+
+    def test_double_negation(self):
+        self.assertEqual(describe_query(convert("NOT (a != 1)")), ("TermQuery", "a", "1"))
+
+    def test_de_morgan(self):
+        self.assertEqual(describe_query(convert("NOT (a = 1 OR b = 2)")),
+                         ("BoolQuery", (), (("TermQuery", "a", "1"), ("TermQuery", "b", "2")), (), (), None))
+
+    def test_hoist_must_not(self):
+        self.assertEqual(describe_query(convert("a = 1 AND NOT (b = 2)")),
+                         ("BoolQuery", (("TermQuery", "a", "1"),), (("TermQuery", "b", "2"),), (), (), None))
+
+    def test_negated_constant(self):
+        self.assertEqual(describe_query(convert("NOT (1 = 0)")), ("MatchAllQuery",))
+
+    def test_use_cache_same_result(self):
+        for condition in ["NOT (a != 1)", "NOT (a = 1 OR b = 2)", "a = 1 AND NOT (b = 2)", "NOT (1 = 0)"]:
+            with self.subTest(condition=condition):
+                expected = describe_query(convert(condition, use_cache=False))
+                self.assertEqual(describe_query(convert(condition, use_cache=True)), expected)
+                self.assertEqual(describe_query(convert(condition, use_cache=True)), expected)  # 命中编译缓存
+
+    def test_input_not_mutated(self):
+        inner = tablestore.BoolQuery(must_not_queries=[tablestore.TermQuery("b", "2")])
+        query = tablestore.BoolQuery(must_queries=[tablestore.TermQuery("a", "1"), inner])
+        before = describe_query(query)
+        must_queries = query.must_queries
+        must_not_queries = query.must_not_queries
+
+        simplified = _simplify_query(query)
+
+        self.assertEqual(describe_query(simplified),
+                         ("BoolQuery", (("TermQuery", "a", "1"),), (("TermQuery", "b", "2"),), (), (), None))
+        self.assertEqual(describe_query(query), before)
+        self.assertIs(query.must_queries, must_queries)
+        self.assertIs(query.must_not_queries, must_not_queries)
+        self.assertEqual(must_not_queries, [])  # SDK 的 BoolQuery 共用默认参数的列表，不能被修改
+        self.assertEqual(tablestore.BoolQuery().must_not_queries, [])
+
+
+class TestConvertWhereClauseToRange(unittest.TestCase):
+    """将 WHERE 子句转化为主键范围查询的起止主键"""
+
+    SCHEMA_PRIMARY_KEY = ["a", "b", "c"]
+
+    def convert_to_range(self, condition: str, schema_primary_key=None):
+        return convert_where_clause_to_range(schema_primary_key or self.SCHEMA_PRIMARY_KEY,
+                                             parse_where_clause(condition))
+
+    def test_equality_prefix_then_range(self):
+        start, end = self.convert_to_range("a = 'x' AND b = 'y' AND c >= 'm' AND c < 'n'")
+        self.assertEqual(start, [("a", "x"), ("b", "y"), ("c", "m")])
+        self.assertEqual(end, [("a", "x"), ("b", "y"), ("c", "n")])
+
+    def test_inclusive_bounds_padding(self):
+        # 起始主键包含边界值时补 INF_MIN，结束主键不包含边界值时补 INF_MIN
+        start, end = self.convert_to_range("a = 'x' AND b >= 'm' AND b < 'n'")
+        self.assertEqual(start, [("a", "x"), ("b", "m"), ("c", tablestore.INF_MIN)])
+        self.assertEqual(end, [("a", "x"), ("b", "n"), ("c", tablestore.INF_MIN)])
+
+    def test_exclusive_bounds_padding(self):
+        # 起始主键不包含边界值时补 INF_MAX，结束主键包含边界值时补 INF_MAX
+        start, end = self.convert_to_range("a = 'x' AND b > 'm' AND b <= 'n'")
+        self.assertEqual(start, [("a", "x"), ("b", "m"), ("c", tablestore.INF_MAX)])
+        self.assertEqual(end, [("a", "x"), ("b", "n"), ("c", tablestore.INF_MAX)])
+
+    def test_unbounded_padding(self):
+        start, end = self.convert_to_range("a = 'x'")
+        self.assertEqual(start, [("a", "x"), ("b", tablestore.INF_MIN), ("c", tablestore.INF_MIN)])
+        self.assertEqual(end, [("a", "x"), ("b", tablestore.INF_MAX), ("c", tablestore.INF_MAX)])
+
+    def test_last_column_exclusive_lower_bound(self):
+        with self.assertRaises(NotSupportedError):
+            self.convert_to_range("id > 'm'", ["id"])
+
+    def test_last_column_inclusive_upper_bound(self):
+        with self.assertRaises(NotSupportedError):
+            self.convert_to_range("id <= 'm'", ["id"])
+
+    def test_condition_after_range_column(self):
+        with self.assertRaises(NotSupportedError):
+            self.convert_to_range("a >= 'x' AND b = 'y'")
+
+    def test_multiple_lower_bounds(self):
+        with self.assertRaises(NotSupportedError):
+            self.convert_to_range("a > 'x' AND a >= 'y'")
+
+
+if __name__ == "__main__":
+    unittest.main()